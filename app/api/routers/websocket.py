@@ -258,7 +258,7 @@ async def get_connection_debug_info():
     connections_debug = []
     
     for websocket, info in manager.connection_info.items():
-        health_info = manager.health_monitor.connection_health.get(websocket, {})
+        health_info = manager.health_monitor.get_connection_health(websocket)
         
         connection_debug = {
             'connection_id': info.get('connection_id', id(websocket)),
@@ -294,7 +294,7 @@ async def get_client_connection_debug(client_id: int):
         for websocket in manager.active_connections[client_id]:
             if websocket in manager.connection_info:
                 info = manager.connection_info[websocket]
-                health_info = manager.health_monitor.connection_health.get(websocket, {})
+                health_info = manager.health_monitor.get_connection_health(websocket)
                 
                 connection_debug = {
                     'connection_id': info.get('connection_id', id(websocket)),
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init
 from app.core.config import settings
 
 celery_app = Celery(
@@ -31,6 +32,12 @@ celery_app.conf.beat_schedule = {
     },
 }
 
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Give each prefork child its own pooled OpenAI client, created once at boot"""
+    from app.services.openai_service import reset_client
+    reset_client()
+
 celery_app.autodiscover_tasks(["app.tasks"])
 
 # Manually import tasks to ensure they're registered
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     reddit_client_id: Optional[str] = None
     reddit_client_secret: Optional[str] = None
     reddit_user_agent: Optional[str] = None
+    reddit_requests_per_minute: int = 55  # Shared across all workers, under Reddit's 60/min
 
     serpapi_api_key: Optional[str] = None
     youtube_api_key: Optional[str] = None
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine, event, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import Pool
+from contextlib import contextmanager
+from typing import Iterator
 import logging
 
 from app.core.config import settings
@@ -46,6 +48,23 @@ def get_db():
         db.close()
 
 
+@contextmanager
+def short_session() -> Iterator[Session]:
+    """Session for one short unit of DB work: commits on success, rolls back on error, always closes.
+    
+    Lets long-running tasks hold a pooled connection only while they actually talk to the database.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def get_connection_pool_stats():
     """Get current connection pool statistics for monitoring"""
     pool = engine.pool
@@ -10,7 +10,7 @@ class MatchedPost(Base):
     client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), index=True, nullable=False)
 
     subreddit = Column(String(255), index=True)
-    reddit_post_id = Column(String(50), unique=True, index=True)
+    reddit_post_id = Column(String(50), index=True)
     title = Column(String(1000))
     url = Column(String(1000))
     author = Column(String(255))
@@ -32,6 +32,11 @@ class MatchedPost(Base):
         Index('idx_client_created', 'client_id', 'created_at'),
         Index('idx_client_reviewed', 'client_id', 'reviewed'),
         Index('idx_subreddit_created', 'subreddit', 'created_at'),
+        # Cross-client time windows (health checks, retention cleanup); keywords_matched
+        # is included so the monitor's top-keyword rollup is served from the index
+        Index('idx_posts_created_keywords', 'created_at', 'keywords_matched'),
+        # A Reddit post is stored at most once per client; also backs the scan's ON CONFLICT
+        Index('idx_client_reddit_post', 'client_id', 'reddit_post_id', unique=True),
     )
 
 class AIResponse(Base):
@@ -56,6 +61,7 @@ class AIResponse(Base):
         Index('idx_responses_post_client', 'post_id', 'client_id'),
         Index('idx_responses_client_created', 'client_id', 'created_at'),
         Index('idx_responses_quality_score', 'score'),
+        Index('idx_responses_created', 'created_at'),
     )
 
 
@@ -21,11 +21,19 @@ def add_indexes():
         "CREATE INDEX IF NOT EXISTS idx_client_created ON matched_posts(client_id, created_at)",
         "CREATE INDEX IF NOT EXISTS idx_client_reviewed ON matched_posts(client_id, reviewed)",
         "CREATE INDEX IF NOT EXISTS idx_subreddit_created ON matched_posts(subreddit, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_posts_created_keywords ON matched_posts(created_at, keywords_matched)",
+        "DROP INDEX IF EXISTS idx_posts_created",
+        
+        # Posts are unique per client rather than globally
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_client_reddit_post ON matched_posts(client_id, reddit_post_id)",
+        "DROP INDEX IF EXISTS ix_matched_posts_reddit_post_id",
+        "CREATE INDEX IF NOT EXISTS ix_matched_posts_reddit_post_id ON matched_posts(reddit_post_id)",
         
         # AIResponse indexes
         "CREATE INDEX IF NOT EXISTS idx_responses_post_client ON ai_responses(post_id, client_id)",
         "CREATE INDEX IF NOT EXISTS idx_responses_client_created ON ai_responses(client_id, created_at)",
         "CREATE INDEX IF NOT EXISTS idx_responses_quality_score ON ai_responses(score)",
+        "CREATE INDEX IF NOT EXISTS idx_responses_created ON ai_responses(created_at)",
         
         # AnalyticsEvent indexes
         "CREATE INDEX IF NOT EXISTS idx_analytics_client_date ON analytics_events(client_id, created_at)",
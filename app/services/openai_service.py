@@ -1,5 +1,6 @@
 from typing import List, Dict, Optional
 import logging
+import httpx
 from openai import OpenAI
 
 from app.core.config import settings
@@ -7,7 +8,27 @@ from app.services.quality_scoring import ResponseQualityScorer
 from app.services.context_service import ContextResearchService, ContextData
 
 logger = logging.getLogger(__name__)
-client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+
+
+def _create_client() -> Optional[OpenAI]:
+    """Build the OpenAI client on a pooled keep-alive HTTP client shared by every call"""
+    if not settings.openai_api_key:
+        return None
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        ),
+    )
+
+
+def reset_client():
+    """Recreate the client so a forked worker process doesn't reuse its parent's sockets"""
+    global client
+    client = _create_client()
+
+
+client = _create_client()
 
 
 async def generate_reddit_replies_with_research(
@@ -1,13 +1,16 @@
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple
 import praw
 import re
 import time
 import logging
 from datetime import datetime, timedelta
-from functools import wraps
+from functools import lru_cache, partial, wraps
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import settings
+from app.core.cache import get_cache, set_cache, redis_client
 
 
 logger = logging.getLogger(__name__)
@@ -72,8 +75,72 @@ class RateLimitManager:
 # Global rate limit manager
 rate_limiter = RateLimitManager()
 
-def with_reddit_error_handling(func):
-    """Decorator to handle Reddit API errors with retry logic"""
+# Refill the bucket from elapsed Redis server time, then take one token or
+# return how many milliseconds the caller has to wait for the next one
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+class SharedTokenBucket:
+    """Redis-backed token bucket so every Celery worker draws from one Reddit request budget"""
+    
+    def __init__(self, key: str, rate: int, per: float = 60.0):
+        self.key = key
+        self.capacity = rate
+        self.refill_per_second = rate / per
+        self._script = None
+    
+    def acquire(self) -> bool:
+        """Block until a token is available. Returns False if Redis can't be reached"""
+        try:
+            if self._script is None:
+                self._script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+            while True:
+                wait_ms = int(self._script(keys=[self.key], args=[self.capacity, self.refill_per_second]))
+                if wait_ms <= 0:
+                    return True
+                logger.debug("Reddit token bucket empty, waiting %dms", wait_ms)
+                time.sleep(wait_ms / 1000)
+        except Exception as e:
+            logger.warning("Shared Reddit rate limiter unavailable, using local limiter: %s", e)
+            return False
+
+reddit_token_bucket = SharedTokenBucket("ratelimit:reddit", settings.reddit_requests_per_minute)
+
+def acquire_reddit_token():
+    """Wait for a slot in the shared Reddit budget, falling back to the per-process limiter"""
+    if not reddit_token_bucket.acquire():
+        rate_limiter.wait_if_needed()
+
+def with_reddit_error_handling(func=None, *, acquire_token: bool = True):
+    """Decorator to handle Reddit API errors with retry logic
+    
+    Each attempt first takes a token from the shared Reddit budget; pass
+    ``acquire_token=False`` for functions whose requests take their own tokens.
+    """
+    if func is None:
+        return partial(with_reddit_error_handling, acquire_token=acquire_token)
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
         max_retries = 3
@@ -81,7 +148,8 @@ def with_reddit_error_handling(func):
         
         while retry_count < max_retries:
             try:
-                rate_limiter.wait_if_needed()
+                if acquire_token:
+                    acquire_reddit_token()
                 return func(*args, **kwargs)
                 
             except praw.exceptions.RedditAPIException as e:
@@ -128,6 +196,25 @@ def with_reddit_error_handling(func):
     
     return wrapper
 
+SUBREDDIT_SCAN_WORKERS = 8
+_scan_executor: Optional[ThreadPoolExecutor] = None
+_thread_state = threading.local()
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    """Create the subreddit scan pool lazily so it is never inherited across a worker fork"""
+    global _scan_executor
+    if _scan_executor is None:
+        _scan_executor = ThreadPoolExecutor(max_workers=SUBREDDIT_SCAN_WORKERS, thread_name_prefix="reddit-scan")
+    return _scan_executor
+
+def _get_thread_reddit_client():
+    """PRAW instances are not thread-safe, so each thread keeps and reuses its own"""
+    reddit = getattr(_thread_state, "reddit", None)
+    if reddit is None:
+        reddit = get_reddit_client()
+        _thread_state.reddit = reddit
+    return reddit
+
 def get_reddit_client():
     """Get Reddit client with proper error handling"""
     if not (settings.reddit_client_id and settings.reddit_client_secret and settings.reddit_user_agent):
@@ -154,10 +241,128 @@ def get_reddit_client():
         raise RedditAPIError(f"Reddit client creation failed: {e}")
 
 
-@with_reddit_error_handling
+@lru_cache(maxsize=256)
+def _compile_keyword_matcher(keywords: Tuple[str, ...]):
+    """Build one regex that finds every plain keyword in a single pass over the text.
+    
+    The lookahead reports the longest keyword starting at each position, so shorter
+    keywords contained in a found one are added through the ``implied`` map.
+    """
+    unique = sorted({k for k in keywords if k}, key=len, reverse=True)
+    if not unique:
+        return None, {}
+    pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in unique) + "))")
+    implied = {k: tuple(other for other in unique if other != k and other in k) for k in unique}
+    return pattern, implied
+
+def _scan_subreddit(
+    sub: str,
+    plain_keywords: List[str],
+    regex_patterns: List[re.Pattern],
+    seen_ids: Set[str],
+) -> List[Dict]:
+    """Fetch the newest posts of one subreddit and return those matching the keywords"""
+    reddit = _get_thread_reddit_client()
+    keyword_pattern, implied_keywords = _compile_keyword_matcher(tuple(plain_keywords))
+    out: List[Dict] = []
+    
+    try:
+        logger.debug(f"Scanning subreddit: r/{sub}")
+        
+        # Each listing is one API request against the shared budget
+        acquire_reddit_token()
+        
+        # Validate subreddit exists and is accessible
+        subreddit = reddit.subreddit(sub)
+        
+        # Get new posts with error handling
+        posts_processed = 0
+        posts_matched = 0
+        
+        for submission in subreddit.new(limit=50):
+            posts_processed += 1
+            
+            # Skip if already seen
+            if submission.id in seen_ids:
+                continue
+            
+            # Extract post content safely
+            try:
+                title = submission.title or ""
+                selftext = submission.selftext or ""
+                author = str(submission.author) if submission.author else "[deleted]"
+                
+                # Handle potential None values
+                score = getattr(submission, 'score', 0) or 0
+                num_comments = getattr(submission, 'num_comments', 0) or 0
+                
+            except Exception as e:
+                logger.warning(f"Error extracting data from post {submission.id}: {e}")
+                continue
+
+            # Perform matching
+            title_lower = title.lower()
+            selftext_lower = selftext.lower()
+            
+            # Plain text matching: one scan per text instead of one per keyword
+            matched_plain = []
+            if keyword_pattern is not None:
+                found = set()
+                for text in (title_lower, selftext_lower):
+                    for match in keyword_pattern.finditer(text):
+                        found.add(match.group(1))
+                for k in tuple(found):
+                    found.update(implied_keywords[k])
+                matched_plain = [k for k in plain_keywords if k in found]
+            
+            # Regex matching
+            matched_regex = []
+            for pattern in regex_patterns:
+                try:
+                    if pattern.search(title) or pattern.search(selftext):
+                        matched_regex.append(f'/{pattern.pattern}/')
+                except Exception as e:
+                    logger.warning(f"Error applying regex pattern {pattern.pattern}: {e}")
+            
+            matched = matched_plain + matched_regex
+            
+            if matched:
+                posts_matched += 1
+                try:
+                    post_data = {
+                        "id": submission.id,
+                        "subreddit": sub,
+                        "title": title,
+                        "url": f"https://www.reddit.com{submission.permalink}",
+                        "author": author,
+                        "content": selftext,
+                        "score": score,
+                        "num_comments": num_comments,
+                        "keywords_matched": ",".join(matched),
+                        "created_utc": getattr(submission, 'created_utc', time.time()),
+                    }
+                    out.append(post_data)
+                    logger.debug(f"Matched post: {title[:50]}... in r/{sub}")
+                    
+                except Exception as e:
+                    logger.error(f"Error processing matched post {submission.id}: {e}")
+        
+        logger.info(f"r/{sub}: processed {posts_processed} posts, matched {posts_matched}")
+        
+    except praw.exceptions.Redirect:
+        logger.warning(f"Subreddit r/{sub} does not exist or is private")
+    except praw.exceptions.Forbidden:
+        logger.warning(f"Access forbidden to subreddit r/{sub}")
+    except Exception as e:
+        logger.error(f"Error scanning subreddit r/{sub}: {e}")
+    
+    return out
+
+# Every subreddit listing takes its own token in _scan_subreddit
+@with_reddit_error_handling(acquire_token=False)
 def find_matching_posts(subreddits: List[str], keywords: List[str], seen_ids: Set[str] | None = None) -> List[Dict]:
     """Find Reddit posts matching keywords with enhanced error handling and rate limiting"""
-    reddit = get_reddit_client()
+    reddit = _get_thread_reddit_client()
     if not reddit:
         logger.warning("Reddit client not available, returning empty results")
         return []
@@ -200,92 +405,19 @@ def find_matching_posts(subreddits: List[str], keywords: List[str], seen_ids: Se
 
     logger.info(f"Searching {len(subreddits)} subreddits with {len(plain_keywords)} plain keywords and {len(regex_patterns)} regex patterns")
 
-    # Process each subreddit
-    for sub in subreddits:
+    # Subreddit fetches are I/O bound, so scan them in parallel; every listing
+    # still takes a token from the shared rate limiter first
+    executor = _get_scan_executor()
+    futures = [
+        (sub, executor.submit(_scan_subreddit, sub, plain_keywords, regex_patterns, seen_ids))
+        for sub in subreddits
+    ]
+    # Collect in subreddit order so results stay deterministic
+    for sub, future in futures:
         try:
-            logger.debug(f"Scanning subreddit: r/{sub}")
-            
-            # Validate subreddit exists and is accessible
-            subreddit = reddit.subreddit(sub)
-            
-            # Get new posts with error handling
-            posts_processed = 0
-            posts_matched = 0
-            
-            for submission in subreddit.new(limit=50):
-                posts_processed += 1
-                
-                # Skip if already seen
-                if submission.id in seen_ids:
-                    continue
-                
-                # Extract post content safely
-                try:
-                    title = submission.title or ""
-                    selftext = submission.selftext or ""
-                    author = str(submission.author) if submission.author else "[deleted]"
-                    
-                    # Handle potential None values
-                    score = getattr(submission, 'score', 0) or 0
-                    num_comments = getattr(submission, 'num_comments', 0) or 0
-                    
-                except Exception as e:
-                    logger.warning(f"Error extracting data from post {submission.id}: {e}")
-                    continue
-
-                # Perform matching
-                title_lower = title.lower()
-                selftext_lower = selftext.lower()
-                
-                # Plain text matching
-                matched_plain = []
-                for k in plain_keywords:
-                    if k and (k in title_lower or k in selftext_lower):
-                        matched_plain.append(k)
-                
-                # Regex matching
-                matched_regex = []
-                for pattern in regex_patterns:
-                    try:
-                        if pattern.search(title) or pattern.search(selftext):
-                            matched_regex.append(f'/{pattern.pattern}/')
-                    except Exception as e:
-                        logger.warning(f"Error applying regex pattern {pattern.pattern}: {e}")
-                
-                matched = matched_plain + matched_regex
-                
-                if matched:
-                    posts_matched += 1
-                    try:
-                        post_data = {
-                            "id": submission.id,
-                            "subreddit": sub,
-                            "title": title,
-                            "url": f"https://www.reddit.com{submission.permalink}",
-                            "author": author,
-                            "content": selftext,
-                            "score": score,
-                            "num_comments": num_comments,
-                            "keywords_matched": ",".join(matched),
-                            "created_utc": getattr(submission, 'created_utc', time.time()),
-                        }
-                        out.append(post_data)
-                        logger.debug(f"Matched post: {title[:50]}... in r/{sub}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing matched post {submission.id}: {e}")
-            
-            logger.info(f"r/{sub}: processed {posts_processed} posts, matched {posts_matched}")
-            
-        except praw.exceptions.Redirect:
-            logger.warning(f"Subreddit r/{sub} does not exist or is private")
-            continue
-        except praw.exceptions.Forbidden:
-            logger.warning(f"Access forbidden to subreddit r/{sub}")
-            continue
+            out.extend(future.result())
         except Exception as e:
             logger.error(f"Error scanning subreddit r/{sub}: {e}")
-            continue
 
     logger.info(f"Total posts found: {len(out)}")
     return out
@@ -348,6 +480,27 @@ def test_reddit_connection() -> Dict[str, any]:
             "authenticated": False
         }
 
+REDDIT_HEALTH_KEY = "reddit:health"
+REDDIT_HEALTH_TTL_OK = 60
+REDDIT_HEALTH_TTL_ERROR = 10
+
+def get_cached_reddit_connection() -> Dict[str, any]:
+    """Return the Reddit connection status, probing the API at most once per TTL window"""
+    try:
+        cached = get_cache(REDDIT_HEALTH_KEY)
+        if cached:
+            return cached
+    except Exception as e:
+        logger.debug("Reddit health cache unavailable: %s", e)
+    
+    status = test_reddit_connection()
+    ttl = REDDIT_HEALTH_TTL_OK if status["status"] == "success" else REDDIT_HEALTH_TTL_ERROR
+    try:
+        set_cache(REDDIT_HEALTH_KEY, status, expiry=ttl)
+    except Exception as e:
+        logger.debug("Failed to cache Reddit health status: %s", e)
+    return status
+
 @with_reddit_error_handling
 def get_subreddit_guidelines(subreddit_name: str) -> Dict[str, any]:
     """Fetch subreddit rules and guidelines"""
@@ -1,8 +1,8 @@
-from typing import Dict, List, Set, Optional
-import json
+from typing import Awaitable, Callable, Dict, List, Set, Optional, Tuple, Union
 import asyncio
 import logging
 import time
+import orjson
 from datetime import datetime, timedelta
 from fastapi import WebSocket, WebSocketDisconnect
 import redis.asyncio as redis
@@ -10,88 +10,187 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# The welcome message is identical for every connection, so it is encoded once
+# at import time; connect() only appends the server timestamp.
+_WELCOME_PREFIX = orjson.dumps({
+    'type': 'welcome',
+    'message': 'WebSocket connection established successfully',
+    'available_features': [
+        'real_time_notifications',
+        'health_monitoring',
+        'connection_statistics',
+        'ping_pong_heartbeat',
+        'automatic_reconnection_support'
+    ],
+    'supported_message_types': [
+        'ping', 'pong', 'subscribe', 'get_stats', 
+        'get_monitoring_status', 'health_check'
+    ]
+}).decode()[:-1]
+
+
+class HealthRecord:
+    """Ping/pong state for a single monitored connection"""
+    
+    __slots__ = ('client_id', 'last_ping', 'last_pong', 'missed_pings', 'is_healthy')
+    
+    def __init__(self, client_id: Optional[int], now: float):
+        self.client_id = client_id
+        self.last_ping = now
+        self.last_pong = now
+        self.missed_pings = 0
+        self.is_healthy = True
+    
+    def to_dict(self) -> Dict:
+        """Dict view of the record for status and debug responses
+        
+        Ping/pong times are tracked on the monotonic clock and converted back
+        to epoch seconds here so callers can format them as wall-clock times.
+        """
+        offset = time.time() - time.monotonic()
+        return {
+            'last_ping': self.last_ping + offset,
+            'last_pong': self.last_pong + offset,
+            'missed_pings': self.missed_pings,
+            'is_healthy': self.is_healthy
+        }
+
 
 class ConnectionHealthMonitor:
     """Monitors WebSocket connection health and handles reconnection"""
     
     def __init__(self):
-        self.connection_health: Dict[WebSocket, Dict] = {}
+        self.connection_health: Dict[WebSocket, HealthRecord] = {}
         self.ping_interval = 30  # seconds
         self.ping_timeout = 10   # seconds
         self.max_missed_pings = 3
+        # Single background task that pings every monitored connection
+        self._sweeper_task: Optional[asyncio.Task] = None
+        # Healthy connection counters, kept up to date on every state change
+        self._healthy_count = 0
+        self._client_healthy: Dict[int, int] = {}
         
-    async def start_health_monitoring(self, websocket: WebSocket):
+    async def start_health_monitoring(self, websocket: WebSocket, client_id: Optional[int] = None):
         """Start health monitoring for a connection"""
-        self.connection_health[websocket] = {
-            'last_ping': time.time(),
-            'last_pong': time.time(),
-            'missed_pings': 0,
-            'is_healthy': True
-        }
+        self.cleanup_connection(websocket)
+        self.connection_health[websocket] = HealthRecord(client_id, time.monotonic())
+        self._adjust_healthy(client_id, 1)
         
-        # Start ping task
-        asyncio.create_task(self._ping_connection(websocket))
-    
-    async def _ping_connection(self, websocket: WebSocket):
-        """Send periodic pings to check connection health"""
+        # Start the shared ping sweeper if it is not already running
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._ping_connections())
+    
+    def _adjust_healthy(self, client_id: Optional[int], delta: int):
+        """Apply a change to the global and per-client healthy counters"""
+        self._healthy_count += delta
+        if client_id is not None:
+            count = self._client_healthy.get(client_id, 0) + delta
+            if count:
+                self._client_healthy[client_id] = count
+            else:
+                self._client_healthy.pop(client_id, None)
+    
+    def _set_healthy(self, health: HealthRecord, is_healthy: bool):
+        """Update a record's health flag and the counters if it changed"""
+        if health.is_healthy != is_healthy:
+            health.is_healthy = is_healthy
+            self._adjust_healthy(health.client_id, 1 if is_healthy else -1)
+    
+    async def _ping_connections(self):
+        """Periodically check and ping all monitored connections from one task"""
         try:
-            while websocket in self.connection_health:
+            while self.connection_health:
                 await asyncio.sleep(self.ping_interval)
                 
-                if websocket not in self.connection_health:
-                    break
-                
-                health = self.connection_health[websocket]
-                current_time = time.time()
+                current_time = time.monotonic()
+                # Compare against one precomputed cutoff instead of subtracting per record
+                stale_before = current_time - self.ping_timeout
+                max_missed_pings = self.max_missed_pings
+                to_ping = []
+                append = to_ping.append
                 
-                # Check if previous ping was answered
-                if current_time - health['last_pong'] > self.ping_timeout:
-                    health['missed_pings'] += 1
-                    logger.warning(f"Missed ping from WebSocket connection (count: {health['missed_pings']})")
+                for websocket, health in tuple(self.connection_health.items()):
+                    # Connections already marked unhealthy are not pinged until they pong again
+                    if not health.is_healthy:
+                        continue
+                    
+                    # Previous ping answered: the common case
+                    if health.last_pong >= stale_before:
+                        health.missed_pings = 0
+                        append(websocket)
+                        continue
+                    
+                    missed_pings = health.missed_pings = health.missed_pings + 1
+                    logger.warning("Missed ping from WebSocket connection (count: %d)", missed_pings)
                     
-                    if health['missed_pings'] >= self.max_missed_pings:
-                        health['is_healthy'] = False
+                    if missed_pings >= max_missed_pings:
+                        self._set_healthy(health, False)
                         logger.error("WebSocket connection marked as unhealthy due to missed pings")
-                        break
-                else:
-                    health['missed_pings'] = 0
-                    health['is_healthy'] = True
+                        continue
+                    
+                    append(websocket)
                 
-                # Send ping
-                try:
-                    await websocket.send_json({
-                        'type': 'ping',
-                        'timestamp': current_time
-                    })
-                    health['last_ping'] = current_time
-                except Exception as e:
-                    logger.error(f"Failed to send ping: {e}")
-                    health['is_healthy'] = False
-                    break
+                if not to_ping:
+                    continue
+                
+                # Send all pings concurrently with a single encoded payload
+                ping_payload = orjson.dumps({
+                    'type': 'ping',
+                    'timestamp': time.time()
+                }).decode()
+                results = await asyncio.gather(
+                    *(websocket.send_text(ping_payload) for websocket in to_ping),
+                    return_exceptions=True
+                )
+                
+                for websocket, result in zip(to_ping, results):
+                    health = self.connection_health.get(websocket)
+                    if health is None:
+                        continue
+                    if isinstance(result, Exception):
+                        logger.error(f"Failed to send ping: {result}")
+                        self._set_healthy(health, False)
+                    else:
+                        health.last_ping = current_time
                     
         except Exception as e:
             logger.error(f"Error in ping monitoring: {e}")
     
-    def handle_pong(self, websocket: WebSocket, timestamp: Optional[float] = None):
-        """Handle pong response from client"""
-        if websocket in self.connection_health:
-            self.connection_health[websocket]['last_pong'] = timestamp or time.time()
-            self.connection_health[websocket]['missed_pings'] = 0
-            self.connection_health[websocket]['is_healthy'] = True
+    def handle_pong(self, websocket: WebSocket):
+        """Handle pong response from client
+        
+        The receive time is taken from the server's monotonic clock; client
+        supplied timestamps are not trusted for timeout arithmetic.
+        """
+        health = self.connection_health.get(websocket)
+        if health is not None:
+            health.last_pong = time.monotonic()
+            health.missed_pings = 0
+            self._set_healthy(health, True)
     
     def is_healthy(self, websocket: WebSocket) -> bool:
         """Check if connection is healthy"""
-        if websocket not in self.connection_health:
-            return False
-        return self.connection_health[websocket]['is_healthy']
+        health = self.connection_health.get(websocket)
+        return health is not None and health.is_healthy
+    
+    def get_connection_health(self, websocket: WebSocket) -> Dict:
+        """Get the health record of a connection as a dict (empty if not monitored)"""
+        health = self.connection_health.get(websocket)
+        return health.to_dict() if health is not None else {}
     
     def cleanup_connection(self, websocket: WebSocket):
         """Clean up health monitoring for a connection"""
-        self.connection_health.pop(websocket, None)
+        health = self.connection_health.pop(websocket, None)
+        if health is not None and health.is_healthy:
+            self._adjust_healthy(health.client_id, -1)
+    
+    def get_client_healthy_count(self, client_id: int) -> int:
+        """Number of healthy connections for a client"""
+        return self._client_healthy.get(client_id, 0)
     
     def get_health_stats(self) -> Dict:
         """Get health statistics for all connections"""
-        healthy_count = sum(1 for health in self.connection_health.values() if health['is_healthy'])
+        healthy_count = self._healthy_count
         total_count = len(self.connection_health)
         
         return {
@@ -111,6 +210,27 @@ class ConnectionManager:
         self.connection_info: Dict[WebSocket, Dict] = {}
         # Redis client for pub/sub
         self.redis_client = None
+        # Outgoing publishes are coalesced and flushed through a Redis pipeline
+        self._publish_queue: Optional[asyncio.Queue] = None
+        self._publish_task: Optional[asyncio.Task] = None
+        self._pubsub_task: Optional[asyncio.Task] = None
+        # Channel name -> client_id routing table for the pub/sub listener
+        self._channel_targets: Dict[Union[bytes, str], Optional[int]] = {}
+        # Notifications are handed to a small pool of long-lived workers
+        self._notify_queue: Optional[asyncio.Queue] = None
+        self._notify_workers: List[asyncio.Task] = []
+        self.notify_queue_size = 10_000
+        self.notify_worker_count = 4
+        self.publish_batch_size = 64
+        self.publish_max_wait = 0.005  # seconds
+        # Per-connection outbound queue limits; a full queue means a stalled client
+        self.outbound_queue_size = 1000
+        self.outbound_drain_batch = 16
+        # Pending closes of overflowed connections, held so they are not garbage collected
+        self._close_tasks: Set[asyncio.Task] = set()
+        # Short-lived cache for get_connection_stats, which dashboards poll frequently
+        self._stats_cache: Optional[Tuple[float, dict]] = None
+        self.stats_cache_ttl = 1.0  # seconds
         # Health monitor
         self.health_monitor = ConnectionHealthMonitor()
         # Connection statistics
@@ -135,8 +255,24 @@ class ConnectionManager:
                 await self.redis_client.ping()
                 logger.info("Redis connection established for WebSocket service")
                 
-                # Start listening for Redis pub/sub messages
-                asyncio.create_task(self._listen_for_updates())
+                # Start listening for Redis pub/sub messages; a single long-lived
+                # subscriber per process fans messages out to local connections
+                if self._pubsub_task is None or self._pubsub_task.done():
+                    self._pubsub_task = asyncio.create_task(self._listen_for_updates())
+                
+                # Start the batched publisher
+                if self._publish_task is None or self._publish_task.done():
+                    self._publish_queue = asyncio.Queue()
+                    self._publish_task = asyncio.create_task(self._publish_flusher())
+                
+                # Start the notification worker pool
+                if not self._notify_workers or all(task.done() for task in self._notify_workers):
+                    self._notify_queue = asyncio.Queue(maxsize=self.notify_queue_size)
+                    self._notify_workers = [
+                        asyncio.create_task(self._notify_worker())
+                        for _ in range(self.notify_worker_count)
+                    ]
+                self._stats_cache = None
                 return True
                 
             except Exception as e:
@@ -158,6 +294,7 @@ class ConnectionManager:
             
             self.active_connections[client_id].add(websocket)
             connection_time = datetime.utcnow()
+            connection_time_iso = connection_time.isoformat()
             connection_id = id(websocket)
             
             self.connection_info[websocket] = {
@@ -169,16 +306,22 @@ class ConnectionManager:
                 'messages_received': 0,
                 'connection_id': connection_id,
                 'authentication_confirmed': True,
-                'health_status': 'healthy'
+                'health_status': 'healthy',
+                'out_queue': asyncio.Queue(maxsize=self.outbound_queue_size)
             }
+            # One sender per connection so slow clients never stall broadcasts
+            self.connection_info[websocket]['sender_task'] = asyncio.create_task(
+                self._sender_loop(websocket, self.connection_info[websocket]['out_queue'])
+            )
             
             # Update statistics
             self.connection_stats['total_connections_ever'] += 1
             self.connection_stats['current_connections'] += 1
             self.connection_stats['last_connection_time'] = connection_time
+            self._stats_cache = None
             
             # Start health monitoring
-            await self.health_monitor.start_health_monitoring(websocket)
+            await self.health_monitor.start_health_monitoring(websocket, client_id)
             
             # Send initial connection confirmation with comprehensive status
             connection_status = {
@@ -186,7 +329,7 @@ class ConnectionManager:
                 'client_id': client_id,
                 'user_id': user_id,
                 'connection_id': connection_id,
-                'server_time': connection_time.isoformat(),
+                'server_time': connection_time_iso,
                 'authentication': {
                     'status': 'confirmed',
                     'client_scoped': True,
@@ -206,28 +349,16 @@ class ConnectionManager:
                 }
             }
             
-            await self.send_personal_message(connection_status, websocket)
+            await self.send_personal_message(connection_status, websocket, connection_time_iso)
             
-            # Send welcome message with available features
-            welcome_message = {
-                'type': 'welcome',
-                'message': 'WebSocket connection established successfully',
-                'available_features': [
-                    'real_time_notifications',
-                    'health_monitoring',
-                    'connection_statistics',
-                    'ping_pong_heartbeat',
-                    'automatic_reconnection_support'
-                ],
-                'supported_message_types': [
-                    'ping', 'pong', 'subscribe', 'get_stats', 
-                    'get_monitoring_status', 'health_check'
-                ]
-            }
+            # Send welcome message with available features; only the timestamp varies
+            await self.send_personal_message(
+                f'{_WELCOME_PREFIX},"server_timestamp":"{connection_time_iso}"}}',
+                websocket
+            )
             
-            await self.send_personal_message(welcome_message, websocket)
-            
-            logger.info(f"WebSocket connected and authenticated: client_id={client_id}, user_id={user_id}, connection_id={connection_id}")
+            logger.info("WebSocket connected and authenticated: client_id=%s, user_id=%s, connection_id=%s",
+                        client_id, user_id, connection_id)
             
         except Exception as e:
             logger.error(f"Failed to establish WebSocket connection: {e}")
@@ -251,29 +382,100 @@ class ConnectionManager:
             # Update statistics
             self.connection_stats['current_connections'] -= 1
             self.connection_stats['disconnections'] += 1
+            self._stats_cache = None
             
             # Clean up health monitoring
             self.health_monitor.cleanup_connection(websocket)
             
+            # Stop the outbound sender unless we are running inside it
+            sender_task = connection_info.get('sender_task')
+            if sender_task is not None and sender_task is not asyncio.current_task():
+                sender_task.cancel()
+            
             # Remove connection info
             del self.connection_info[websocket]
             
-            logger.info(f"WebSocket disconnected: client_id={client_id}, user_id={user_id}")
+            logger.info("WebSocket disconnected: client_id=%s, user_id=%s", client_id, user_id)
         else:
-            logger.warning("Attempted to disconnect unknown WebSocket connection")
+            # Expected when the router's handler exits after the manager already dropped the socket
+            logger.debug("WebSocket connection already disconnected")
     
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send a message to a specific WebSocket connection with error handling"""
+    @staticmethod
+    def _stamp_and_encode(message: dict, now_iso: Optional[str] = None,
+                          client_id: Optional[int] = None) -> bytes:
+        """Stamp server_timestamp (and target_client_id) into a copy of a message and encode it
+        
+        Every send path goes through this one helper, so stamping and
+        serialization happen in a single envelope build and orjson call.
+        """
+        envelope = {**message, 'server_timestamp': now_iso or datetime.utcnow().isoformat()}
+        if client_id:
+            envelope['target_client_id'] = client_id
+        return orjson.dumps(envelope, option=orjson.OPT_NON_STR_KEYS)
+    
+    async def _sender_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Deliver queued payloads to a single connection in order"""
         try:
-            # Add timestamp to all messages
-            message['server_timestamp'] = datetime.utcnow().isoformat()
-            
-            await websocket.send_text(json.dumps(message))
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self.outbound_drain_batch:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                for payload in batch:
+                    await websocket.send_text(payload)
+                
+                # Update connection statistics once per drained batch
+                info = self.connection_info.get(websocket)
+                if info is not None:
+                    info['messages_sent'] += len(batch)
+                    info['last_activity'] = datetime.utcnow()
+                    
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending queued message: {e}")
+            self.disconnect(websocket)
+    
+    def _enqueue(self, websocket: WebSocket, payload: str) -> bool:
+        """Queue a payload for a connection; returns False if it cannot be delivered"""
+        info = self.connection_info.get(websocket)
+        if info is None:
+            return False
+        try:
+            info['out_queue'].put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Outbound queue full for client %s, dropping connection", info['client_id'])
+            # Close the socket too, so the client reconnects instead of lingering unmanaged;
+            # 1013 (try again later) tells it the server shed it under load
+            close_task = asyncio.create_task(websocket.close(code=1013))
+            self._close_tasks.add(close_task)
+            close_task.add_done_callback(self._close_tasks.discard)
+            return False
+    
+    async def send_personal_message(self, message: Union[dict, str], websocket: WebSocket,
+                                    now_iso: Optional[str] = None):
+        """Send a message to a specific WebSocket connection with error handling
+        
+        ``message`` may be a dict (stamped and serialized here) or a payload that
+        was already serialized by the caller. Messages are queued and delivered by
+        the connection's sender task; sockets that are not registered are skipped.
+        Callers sending several messages at once can pass ``now_iso`` to share one
+        timestamp.
+        """
+        try:
+            if isinstance(message, dict):
+                # Add timestamp to all messages without mutating the caller's dict
+                message = self._stamp_and_encode(message, now_iso).decode()
             
-            # Update connection statistics
-            if websocket in self.connection_info:
-                self.connection_info[websocket]['messages_sent'] += 1
-                self.connection_info[websocket]['last_activity'] = datetime.utcnow()
+            if websocket not in self.connection_info:
+                # Unmanaged sockets have no bounded queue to absorb a slow client
+                logger.debug("Dropping message for unregistered WebSocket connection")
+            elif not self._enqueue(websocket, message):
+                self.disconnect(websocket)
                 
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
@@ -282,52 +484,65 @@ class ConnectionManager:
     async def broadcast_to_client(self, message: dict, client_id: int):
         """Broadcast a message to all connections for a specific client with health checks"""
         if client_id not in self.active_connections:
-            logger.debug(f"No active connections for client {client_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"No active connections for client {client_id}")
             return
         
-        # Add timestamp and client info to message
-        message['server_timestamp'] = datetime.utcnow().isoformat()
-        message['target_client_id'] = client_id
+        # Stamp timestamp and client info into a new envelope, serialized once for all sockets
+        payload = self._stamp_and_encode(message, client_id=client_id).decode()
         
+        await self._send_to_client(payload, client_id)
+    
+    async def _send_to_client(self, payload: str, client_id: int):
+        """Queue an already serialized payload for every healthy connection of a client"""
+        connections = self.active_connections.get(client_id)
+        if not connections:
+            return
+        
+        # Bind hot-loop lookups to locals once per broadcast
+        is_healthy = self.health_monitor.is_healthy
+        enqueue = self._enqueue
         disconnected = set()
         healthy_connections = 0
         
-        for connection in self.active_connections[client_id].copy():
-            try:
-                # Check connection health before sending
-                if not self.health_monitor.is_healthy(connection):
-                    logger.warning(f"Skipping unhealthy connection for client {client_id}")
-                    disconnected.add(connection)
-                    continue
-                
-                await connection.send_text(json.dumps(message))
+        # Enqueueing never yields and disconnects are applied after the loop,
+        # so the set can be iterated without taking a copy
+        for connection in connections:
+            # Check connection health before sending
+            if not is_healthy(connection):
+                logger.warning("Skipping unhealthy connection for client %s", client_id)
+                disconnected.add(connection)
+                continue
+            
+            if enqueue(connection, payload):
                 healthy_connections += 1
-                
-                # Update connection statistics
-                if connection in self.connection_info:
-                    self.connection_info[connection]['messages_sent'] += 1
-                    self.connection_info[connection]['last_activity'] = datetime.utcnow()
-                    
-            except Exception as e:
-                logger.error(f"Error broadcasting to client {client_id}: {e}")
+            else:
                 disconnected.add(connection)
         
         # Clean up disconnected connections
         for connection in disconnected:
             self.disconnect(connection)
         
-        logger.debug(f"Broadcast to client {client_id}: {healthy_connections} connections reached")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Broadcast to client {client_id}: {healthy_connections} connections reached")
     
     async def broadcast_to_all(self, message: dict):
         """Broadcast a message to all active connections"""
-        for client_id in list(self.active_connections.keys()):
-            await self.broadcast_to_client(message, client_id)
+        # Stamp and serialize once; the same payload is reused for every client
+        payload = self._stamp_and_encode(message).decode()
+        await self._send_to_all(payload)
+    
+    async def _send_to_all(self, payload: str):
+        """Queue an already serialized payload for every active connection"""
+        for client_id in tuple(self.active_connections):
+            await self._send_to_client(payload, client_id)
     
     async def publish_update(self, event_type: str, data: dict, client_id: int = None):
         """Publish an update to Redis for distribution"""
         if not self.redis_client:
             return
         
+        # Build the final wire payload here so the listener can forward it as-is
         message = {
             'type': event_type,
             'data': data,
@@ -337,10 +552,82 @@ class ConnectionManager:
         
         try:
             channel = f"updates:{client_id}" if client_id else "updates:all"
-            await self.redis_client.publish(channel, json.dumps(message))
+            payload = self._stamp_and_encode(message, client_id=client_id)
+            
+            # Hand off to the batched publisher when it runs on this loop,
+            # otherwise (e.g. one-off asyncio.run from a task) publish directly
+            if self._publish_task is not None and not self._publish_task.done():
+                self._publish_queue.put_nowait((channel, payload))
+            else:
+                await self.redis_client.publish(channel, payload)
         except Exception as e:
             print(f"Error publishing update: {e}")
     
+    async def notify(self, event_type: str, data: dict, client_id: int = None):
+        """Queue a notification for the worker pool, publishing inline if it is not running"""
+        if self._notify_workers and not all(task.done() for task in self._notify_workers):
+            try:
+                self._notify_queue.put_nowait((event_type, data, client_id))
+                return
+            except asyncio.QueueFull:
+                logger.warning("Notification queue full, publishing %s inline", event_type)
+        
+        await self.publish_update(event_type, data, client_id)
+    
+    async def _notify_worker(self):
+        """Publish queued notifications"""
+        while True:
+            event_type, data, client_id = await self._notify_queue.get()
+            try:
+                await self.publish_update(event_type, data, client_id)
+            except Exception as e:
+                logger.error(f"Error publishing {event_type} notification: {e}")
+    
+    async def _publish_flusher(self):
+        """Drain queued publishes and send them to Redis in pipelined batches"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._publish_queue.get()]
+            deadline = loop.time() + self.publish_max_wait
+            
+            # Collect more messages until the batch is full or the wait window closes
+            while len(batch) < self.publish_batch_size:
+                try:
+                    batch.append(self._publish_queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._publish_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for channel, payload in batch:
+                        pipe.publish(channel, payload)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Error flushing {len(batch)} batched updates: {e}")
+    
+    def _channel_target(self, channel: Union[bytes, str]) -> Optional[int]:
+        """Resolve a pub/sub channel to its client_id (None for updates:all), memoized per channel"""
+        try:
+            return self._channel_targets[channel]
+        except KeyError:
+            pass
+        
+        name = channel.decode() if isinstance(channel, bytes) else channel
+        suffix = name.split(':', 1)[1]
+        target = None if suffix == 'all' else int(suffix)
+        self._channel_targets[channel] = target
+        return target
+    
     async def _listen_for_updates(self):
         """Listen for Redis pub/sub messages and broadcast to WebSocket clients"""
         if not self.redis_client:
@@ -353,13 +640,23 @@ class ConnectionManager:
             async for message in pubsub.listen():
                 if message['type'] == 'pmessage':
                     try:
-                        data = json.loads(message['data'])
-                        client_id = data.get('client_id')
+                        # Route on the channel name (updates:<client_id> or updates:all);
+                        # payloads are already stamped by publish_update, so the body is
+                        # forwarded without being parsed or re-serialized
+                        target = self._channel_target(message['channel'])
+                        
+                        # Nothing to do (and nothing to decode) for clients with no
+                        # connections on this host
+                        if target is not None and target not in self.active_connections:
+                            continue
+                        
+                        raw = message['data']
+                        payload = raw.decode() if isinstance(raw, bytes) else raw
                         
-                        if client_id:
-                            await self.broadcast_to_client(data, client_id)
+                        if target is None:
+                            await self._send_to_all(payload)
                         else:
-                            await self.broadcast_to_all(data)
+                            await self._send_to_client(payload, target)
                     except Exception as e:
                         print(f"Error processing Redis message: {e}")
         except Exception as e:
@@ -367,6 +664,10 @@ class ConnectionManager:
     
     def get_connection_stats(self) -> dict:
         """Get comprehensive statistics about active connections"""
+        now = time.monotonic()
+        if self._stats_cache is not None and now - self._stats_cache[0] < self.stats_cache_ttl:
+            return self._stats_cache[1]
+        
         total_connections = sum(len(connections) for connections in self.active_connections.values())
         health_stats = self.health_monitor.get_health_stats()
         
@@ -376,14 +677,14 @@ class ConnectionManager:
         # Get per-client statistics
         client_stats = {}
         for client_id, connections in self.active_connections.items():
-            healthy_count = sum(1 for conn in connections if self.health_monitor.is_healthy(conn))
+            healthy_count = self.health_monitor.get_client_healthy_count(client_id)
             client_stats[client_id] = {
                 'total_connections': len(connections),
                 'healthy_connections': healthy_count,
                 'unhealthy_connections': len(connections) - healthy_count
             }
         
-        return {
+        stats = {
             'current_connections': total_connections,
             'clients_connected': len(self.active_connections),
             'connections_per_client': client_stats,
@@ -398,9 +699,11 @@ class ConnectionManager:
             },
             'redis_status': {
                 'connected': self.redis_client is not None,
-                'pub_sub_active': hasattr(self, '_pubsub_task') and not self._pubsub_task.done() if hasattr(self, '_pubsub_task') else False
+                'pub_sub_active': self._pubsub_task is not None and not self._pubsub_task.done()
             }
         }
+        self._stats_cache = (now, stats)
+        return stats
     
     def get_monitoring_status(self) -> dict:
         """Get monitoring and health status for dashboard display"""
@@ -438,37 +741,47 @@ class WebSocketNotifier:
     @staticmethod
     async def notify_new_post(client_id: int, post_data: dict):
         """Notify about a new matched post"""
-        await manager.publish_update('new_post', post_data, client_id)
+        await manager.notify('new_post', post_data, client_id)
     
     @staticmethod
     async def notify_new_response(client_id: int, response_data: dict):
         """Notify about a new AI response"""
-        await manager.publish_update('new_response', response_data, client_id)
+        await manager.notify('new_response', response_data, client_id)
+    
+    @staticmethod
+    async def notify_new_posts_bulk(client_id: int, posts: List[dict]):
+        """Notify about a batch of new matched posts in a single message"""
+        await manager.notify('new_posts', {'posts': posts, 'count': len(posts)}, client_id)
+    
+    @staticmethod
+    async def notify_new_responses_bulk(client_id: int, responses: List[dict]):
+        """Notify about a batch of new AI responses in a single message"""
+        await manager.notify('new_responses', {'responses': responses, 'count': len(responses)}, client_id)
     
     @staticmethod
     async def notify_response_copied(client_id: int, response_id: int):
         """Notify when a response is copied"""
-        await manager.publish_update('response_copied', {'response_id': response_id}, client_id)
+        await manager.notify('response_copied', {'response_id': response_id}, client_id)
     
     @staticmethod
     async def notify_scan_started(client_id: int = None):
         """Notify when a Reddit scan starts"""
-        await manager.publish_update('scan_started', {}, client_id)
+        await manager.notify('scan_started', {}, client_id)
     
     @staticmethod
     async def notify_scan_completed(client_id: int, results: dict):
         """Notify when a Reddit scan completes"""
-        await manager.publish_update('scan_completed', results, client_id)
+        await manager.notify('scan_completed', results, client_id)
     
     @staticmethod
     async def notify_analytics_update(client_id: int, analytics_data: dict):
         """Notify about analytics updates"""
-        await manager.publish_update('analytics_update', analytics_data, client_id)
+        await manager.notify('analytics_update', analytics_data, client_id)
     
     @staticmethod
     async def notify_system_status(status: str, message: str):
         """Notify about system-wide status changes"""
-        await manager.publish_update('system_status', {
+        await manager.notify('system_status', {
             'status': status,
             'message': message,
             'timestamp': datetime.utcnow().isoformat()
@@ -478,18 +791,18 @@ class WebSocketNotifier:
     async def notify_monitoring_status_update(client_id: int = None):
         """Notify about monitoring status updates"""
         status = manager.get_monitoring_status()
-        await manager.publish_update('monitoring_status_update', status, client_id)
+        await manager.notify('monitoring_status_update', status, client_id)
     
     @staticmethod
     async def notify_connection_health_update(client_id: int):
         """Notify about connection health changes"""
         health_stats = manager.health_monitor.get_health_stats()
-        await manager.publish_update('connection_health_update', health_stats, client_id)
+        await manager.notify('connection_health_update', health_stats, client_id)
     
     @staticmethod
     async def notify_reddit_api_status(status: str, message: str, client_id: int = None):
         """Notify about Reddit API status changes"""
-        await manager.publish_update('reddit_api_status', {
+        await manager.notify('reddit_api_status', {
             'status': status,
             'message': message,
             'timestamp': datetime.utcnow().isoformat()
@@ -506,9 +819,9 @@ async def websocket_endpoint(websocket: WebSocket, client_id: int, user_id: int)
             data = await websocket.receive_text()
             
             try:
-                message = json.loads(data)
+                message = orjson.loads(data)
                 await handle_websocket_message(websocket, message, client_id, user_id)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 await manager.send_personal_message({
                     'type': 'error',
                     'message': 'Invalid JSON format'
@@ -521,158 +834,181 @@ async def websocket_endpoint(websocket: WebSocket, client_id: int, user_id: int)
         manager.disconnect(websocket)
 
 
-async def handle_websocket_message(websocket: WebSocket, message: dict, client_id: int, user_id: int):
-    """Handle incoming WebSocket messages from clients with enhanced functionality and lifecycle management"""
-    message_type = message.get('type')
+async def _handle_ping(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle client ping with enhanced response"""
+    client_timestamp = message.get('timestamp', time.time())
+    server_timestamp = time.time()
+    
+    await manager.send_personal_message({
+        'type': 'pong',
+        'client_timestamp': client_timestamp,
+        'server_timestamp': server_timestamp,
+        'round_trip_time': server_timestamp - client_timestamp if isinstance(client_timestamp, (int, float)) else None,
+        'connection_healthy': manager.health_monitor.is_healthy(websocket)
+    }, websocket)
+
+
+async def _handle_pong(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle pong response for health monitoring"""
+    manager.health_monitor.handle_pong(websocket)
+    
+    # Send acknowledgment
+    await manager.send_personal_message({
+        'type': 'pong_acknowledged',
+        'timestamp': datetime.utcnow().isoformat(),
+        'health_status': 'healthy'
+    }, websocket)
+
+
+async def _handle_subscribe(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle subscription to specific event types"""
+    event_types = message.get('events', [])
+    await manager.send_personal_message({
+        'type': 'subscribed',
+        'events': event_types,
+        'client_id': client_id,
+        'subscription_active': True,
+        'timestamp': datetime.utcnow().isoformat()
+    }, websocket)
+
+
+async def _handle_get_stats(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Send connection statistics"""
+    stats = manager.get_connection_stats()
+    await manager.send_personal_message({
+        'type': 'stats',
+        'data': stats,
+        'requested_by': {
+            'client_id': client_id,
+            'user_id': user_id,
+            'connection_id': manager.connection_info[websocket].get('connection_id', id(websocket))
+        }
+    }, websocket)
+
+
+async def _handle_get_monitoring_status(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Send monitoring status for dashboard"""
+    status = manager.get_monitoring_status()
+    await manager.send_personal_message({
+        'type': 'monitoring_status',
+        'data': status,
+        'requested_by': {
+            'client_id': client_id,
+            'user_id': user_id
+        }
+    }, websocket)
+
+
+async def _handle_health_check(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Respond with comprehensive connection health information"""
+    connection_info = manager.connection_info.get(websocket, {})
+    health_info = manager.health_monitor.get_connection_health(websocket)
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    connected_at = connection_info.get('connected_at', now)
+    
+    health_response = {
+        'connection_healthy': manager.health_monitor.is_healthy(websocket),
+        'server_time': now_iso,
+        'connection_info': {
+            'connection_id': connection_info.get('connection_id', id(websocket)),
+            'connected_at': connected_at.isoformat(),
+            'uptime_seconds': (now - connected_at).total_seconds(),
+            'messages_sent': connection_info.get('messages_sent', 0),
+            'messages_received': connection_info.get('messages_received', 0),
+            'last_activity': connection_info.get('last_activity', now).isoformat()
+        },
+        'health_metrics': {
+            'last_ping': datetime.fromtimestamp(health_info['last_ping']).isoformat() if health_info.get('last_ping') else None,
+            'last_pong': datetime.fromtimestamp(health_info['last_pong']).isoformat() if health_info.get('last_pong') else None,
+            'missed_pings': health_info.get('missed_pings', 0),
+            'ping_interval_seconds': manager.health_monitor.ping_interval,
+            'ping_timeout_seconds': manager.health_monitor.ping_timeout
+        },
+        'client_info': {
+            'client_id': client_id,
+            'user_id': user_id,
+            'authentication_confirmed': connection_info.get('authentication_confirmed', False)
+        }
+    }
     
-    # Update connection activity
-    if websocket in manager.connection_info:
-        manager.connection_info[websocket]['messages_received'] += 1
-        manager.connection_info[websocket]['last_activity'] = datetime.utcnow()
-    
-    if message_type == 'ping':
-        # Handle client ping with enhanced response
-        client_timestamp = message.get('timestamp', time.time())
-        server_timestamp = time.time()
-        
-        await manager.send_personal_message({
-            'type': 'pong',
-            'client_timestamp': client_timestamp,
-            'server_timestamp': server_timestamp,
-            'round_trip_time': server_timestamp - client_timestamp if isinstance(client_timestamp, (int, float)) else None,
-            'connection_healthy': manager.health_monitor.is_healthy(websocket)
-        }, websocket)
-    
-    elif message_type == 'pong':
-        # Handle pong response for health monitoring
-        timestamp = message.get('timestamp') or message.get('server_timestamp')
-        manager.health_monitor.handle_pong(websocket, timestamp)
-        
-        # Send acknowledgment
-        await manager.send_personal_message({
-            'type': 'pong_acknowledged',
+    await manager.send_personal_message({
+        'type': 'health_response',
+        'data': health_response
+    }, websocket, now_iso)
+
+
+async def _handle_connection_test(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle connection test requests"""
+    test_data = message.get('test_data', {})
+    
+    await manager.send_personal_message({
+        'type': 'connection_test_response',
+        'original_data': test_data,
+        'server_response': {
+            'status': 'success',
             'timestamp': datetime.utcnow().isoformat(),
-            'health_status': 'healthy'
-        }, websocket)
-        
-    elif message_type == 'subscribe':
-        # Handle subscription to specific event types
-        event_types = message.get('events', [])
-        await manager.send_personal_message({
-            'type': 'subscribed',
-            'events': event_types,
+            'connection_id': manager.connection_info[websocket].get('connection_id', id(websocket)),
+            'echo_test': 'Connection test successful'
+        }
+    }, websocket)
+
+
+async def _handle_get_connection_info(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Send detailed connection information"""
+    connection_info = manager.connection_info.get(websocket, {})
+    
+    await manager.send_personal_message({
+        'type': 'connection_info',
+        'data': {
+            'connection_id': connection_info.get('connection_id', id(websocket)),
             'client_id': client_id,
-            'subscription_active': True,
-            'timestamp': datetime.utcnow().isoformat()
-        }, websocket)
-    
-    elif message_type == 'get_stats':
-        # Send connection statistics
-        stats = manager.get_connection_stats()
-        await manager.send_personal_message({
-            'type': 'stats',
-            'data': stats,
-            'requested_by': {
-                'client_id': client_id,
-                'user_id': user_id,
-                'connection_id': manager.connection_info[websocket].get('connection_id', id(websocket))
-            }
-        }, websocket)
-    
-    elif message_type == 'get_monitoring_status':
-        # Send monitoring status for dashboard
-        status = manager.get_monitoring_status()
-        await manager.send_personal_message({
-            'type': 'monitoring_status',
-            'data': status,
-            'requested_by': {
-                'client_id': client_id,
-                'user_id': user_id
-            }
-        }, websocket)
-    
-    elif message_type == 'health_check':
-        # Respond with comprehensive connection health information
-        connection_info = manager.connection_info.get(websocket, {})
-        health_info = manager.health_monitor.connection_health.get(websocket, {})
-        
-        health_response = {
-            'connection_healthy': manager.health_monitor.is_healthy(websocket),
-            'server_time': datetime.utcnow().isoformat(),
-            'connection_info': {
-                'connection_id': connection_info.get('connection_id', id(websocket)),
-                'connected_at': connection_info.get('connected_at', datetime.utcnow()).isoformat(),
-                'uptime_seconds': (datetime.utcnow() - connection_info.get('connected_at', datetime.utcnow())).total_seconds(),
-                'messages_sent': connection_info.get('messages_sent', 0),
-                'messages_received': connection_info.get('messages_received', 0),
-                'last_activity': connection_info.get('last_activity', datetime.utcnow()).isoformat()
-            },
-            'health_metrics': {
-                'last_ping': datetime.fromtimestamp(health_info['last_ping']).isoformat() if health_info.get('last_ping') else None,
-                'last_pong': datetime.fromtimestamp(health_info['last_pong']).isoformat() if health_info.get('last_pong') else None,
-                'missed_pings': health_info.get('missed_pings', 0),
-                'ping_interval_seconds': manager.health_monitor.ping_interval,
-                'ping_timeout_seconds': manager.health_monitor.ping_timeout
-            },
-            'client_info': {
-                'client_id': client_id,
-                'user_id': user_id,
-                'authentication_confirmed': connection_info.get('authentication_confirmed', False)
+            'user_id': user_id,
+            'connected_at': connection_info.get('connected_at', datetime.utcnow()).isoformat(),
+            'authentication_status': 'confirmed',
+            'service_features': {
+                'health_monitoring': True,
+                'real_time_notifications': True,
+                'redis_pub_sub': manager.redis_client is not None,
+                'connection_statistics': True
             }
         }
-        
-        await manager.send_personal_message({
-            'type': 'health_response',
-            'data': health_response
-        }, websocket)
-    
-    elif message_type == 'connection_test':
-        # Handle connection test requests
-        test_data = message.get('test_data', {})
-        
-        await manager.send_personal_message({
-            'type': 'connection_test_response',
-            'original_data': test_data,
-            'server_response': {
-                'status': 'success',
-                'timestamp': datetime.utcnow().isoformat(),
-                'connection_id': manager.connection_info[websocket].get('connection_id', id(websocket)),
-                'echo_test': 'Connection test successful'
-            }
-        }, websocket)
+    }, websocket)
+
+
+async def _handle_unknown(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle unknown message types with helpful error response"""
+    await manager.send_personal_message({
+        'type': 'error',
+        'error_code': 'UNKNOWN_MESSAGE_TYPE',
+        'message': f"Unknown message type: {message.get('type')}",
+        'received_message': message,
+        'supported_types': _SUPPORTED_MESSAGE_TYPES,
+        'timestamp': datetime.utcnow().isoformat()
+    }, websocket)
+
+
+# Message type -> handler, resolved with a single dict lookup per message
+_MESSAGE_HANDLERS: Dict[str, Callable[[WebSocket, dict, int, int], Awaitable[None]]] = {
+    'ping': _handle_ping,
+    'pong': _handle_pong,
+    'subscribe': _handle_subscribe,
+    'get_stats': _handle_get_stats,
+    'get_monitoring_status': _handle_get_monitoring_status,
+    'health_check': _handle_health_check,
+    'connection_test': _handle_connection_test,
+    'get_connection_info': _handle_get_connection_info,
+}
+_SUPPORTED_MESSAGE_TYPES = list(_MESSAGE_HANDLERS)
+
+
+async def handle_websocket_message(websocket: WebSocket, message: dict, client_id: int, user_id: int):
+    """Handle incoming WebSocket messages from clients with enhanced functionality and lifecycle management"""
+    # Update connection activity
+    connection_info = manager.connection_info.get(websocket)
+    if connection_info is not None:
+        connection_info['messages_received'] += 1
+        connection_info['last_activity'] = datetime.utcnow()
     
-    elif message_type == 'get_connection_info':
-        # Send detailed connection information
-        connection_info = manager.connection_info.get(websocket, {})
-        
-        await manager.send_personal_message({
-            'type': 'connection_info',
-            'data': {
-                'connection_id': connection_info.get('connection_id', id(websocket)),
-                'client_id': client_id,
-                'user_id': user_id,
-                'connected_at': connection_info.get('connected_at', datetime.utcnow()).isoformat(),
-                'authentication_status': 'confirmed',
-                'service_features': {
-                    'health_monitoring': True,
-                    'real_time_notifications': True,
-                    'redis_pub_sub': manager.redis_client is not None,
-                    'connection_statistics': True
-                }
-            }
-        }, websocket)
-    
-    else:
-        # Handle unknown message types with helpful error response
-        await manager.send_personal_message({
-            'type': 'error',
-            'error_code': 'UNKNOWN_MESSAGE_TYPE',
-            'message': f'Unknown message type: {message_type}',
-            'received_message': message,
-            'supported_types': [
-                'ping', 'pong', 'subscribe', 'get_stats', 
-                'get_monitoring_status', 'health_check', 
-                'connection_test', 'get_connection_info'
-            ],
-            'timestamp': datetime.utcnow().isoformat()
-        }, websocket)
\ No newline at end of file
+    handler = _MESSAGE_HANDLERS.get(message.get('type'), _handle_unknown)
+    await handler(websocket, message, client_id, user_id)
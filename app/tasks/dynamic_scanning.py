@@ -6,10 +6,13 @@ from datetime import datetime, timezone, timedelta
 from typing import List
 import logging
 
+from celery import chord
+from sqlalchemy import String, and_, exists, func, literal, or_
+
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.config import ClientConfig
-from app.tasks.reddit_tasks import scan_reddit
+from app.tasks.reddit_tasks import scan_client, finalize_scan
 
 logger = logging.getLogger(__name__)
 
@@ -23,64 +26,51 @@ def scan_reddit_dynamic(self):
     try:
         logger.info("Starting dynamic Reddit scan check")
         
-        # Get all active configs
-        active_configs = db.query(ClientConfig).filter(ClientConfig.is_active == True).all()
-        
-        if not active_configs:
-            logger.info("No active configs found")
-            return {"status": "no_configs", "scanned_configs": 0}
-        
         current_time = datetime.now(timezone.utc)
         current_hour = current_time.hour
         current_weekday = current_time.isoweekday()  # 1=Monday, 7=Sunday
         
-        configs_to_scan = []
+        # Unset/0 end hour means 23 and unset/0 interval means 5, as before
+        start_hour = func.coalesce(ClientConfig.scan_start_hour, 0)
+        end_hour = func.coalesce(func.nullif(ClientConfig.scan_end_hour, 0), 23)
+        scan_interval = func.coalesce(func.nullif(ClientConfig.scan_interval_minutes, 0), 5)
+        active_days = "," + func.replace(
+            func.coalesce(func.nullif(ClientConfig.scan_days, ""), "1,2,3,4,5,6,7"), " ", "",
+            type_=String,
+        ) + ","
         
-        for config in active_configs:
-            # Check if current time is within active hours
-            start_hour = config.scan_start_hour or 0
-            end_hour = config.scan_end_hour or 23
-            
-            # Handle overnight schedules (e.g., 22:00 to 06:00)
-            if start_hour <= end_hour:
-                hour_check = start_hour <= current_hour <= end_hour
-            else:
-                hour_check = current_hour >= start_hour or current_hour <= end_hour
-            
-            if not hour_check:
-                logger.debug(f"Config {config.id}: Outside active hours ({start_hour}-{end_hour})")
-                continue
-            
-            # Check if current day is active
-            active_days = config.scan_days or "1,2,3,4,5,6,7"
-            active_day_list = [int(d.strip()) for d in active_days.split(',') if d.strip().isdigit()]
-            
-            if current_weekday not in active_day_list:
-                logger.debug(f"Config {config.id}: Not an active day ({current_weekday})")
-                continue
-            
-            # Check if enough time has passed since last scan
-            scan_interval = config.scan_interval_minutes or 5
-            
-            # Get last scan time (you might want to track this in database)
-            # For now, we'll use a simple approach based on interval
-            minutes_since_hour_start = current_time.minute
-            
-            # Check if this interval slot should trigger a scan
-            if minutes_since_hour_start % scan_interval == 0:
-                configs_to_scan.append(config)
-                logger.info(f"Config {config.id} scheduled for scan (interval: {scan_interval}min)")
+        # Evaluate the schedule in the database instead of looping over every config
+        # Only the id and interval are needed, so skip hydrating full ORM objects
+        configs_to_scan = db.query(ClientConfig.id, scan_interval.label("scan_interval")).filter(
+            ClientConfig.is_active == True,
+            # Within active hours, handling overnight schedules (e.g., 22:00 to 06:00)
+            or_(
+                and_(start_hour <= end_hour, start_hour <= current_hour, end_hour >= current_hour),
+                and_(start_hour > end_hour, or_(start_hour <= current_hour, end_hour >= current_hour)),
+            ),
+            # Current day is active
+            active_days.like(f"%,{current_weekday},%"),
+            # This interval slot should trigger a scan
+            literal(current_time.minute) % scan_interval == 0,
+        ).all()
+        
+        for config in configs_to_scan:
+            logger.info(f"Config {config.id} scheduled for scan (interval: {config.scan_interval}min)")
         
         if configs_to_scan:
-            # Trigger the main scan task
+            # Fan out one task per due config and aggregate the results at the end
             logger.info(f"Triggering scan for {len(configs_to_scan)} configs")
-            scan_reddit.delay()
+            chord(scan_client.s(c.id) for c in configs_to_scan)(finalize_scan.s())
             
             return {
                 "status": "scan_triggered",
                 "scanned_configs": len(configs_to_scan),
                 "config_ids": [c.id for c in configs_to_scan]
             }
+        # Only when nothing is due, tell "no active configs at all" apart with a cheap EXISTS
+        elif not db.query(exists().where(ClientConfig.is_active == True)).scalar():
+            logger.info("No active configs found")
+            return {"status": "no_configs", "scanned_configs": 0}
         else:
             logger.debug("No configs need scanning at this time")
             return {"status": "no_scan_needed", "scanned_configs": 0}
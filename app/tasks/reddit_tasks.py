@@ -1,16 +1,20 @@
-from typing import List
+from typing import Dict, List, Optional
 import asyncio
 import logging
+import time
 from datetime import datetime
 
+from celery import group
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.celery_app import celery_app
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, short_session
 from app.models.config import ClientConfig
 from app.models.post import MatchedPost, AIResponse
 from app.models.analytics import AnalyticsEvent
-from app.services.reddit_service import find_matching_posts, RedditAPIError, test_reddit_connection
+from app.services.reddit_service import find_matching_posts, RedditAPIError, get_cached_reddit_connection
 from app.services.context_service import fetch_google_results, fetch_youtube_results
 from app.services.openai_service import generate_reddit_replies
 from app.services.email_service import send_email
@@ -20,27 +24,191 @@ from app.services.analytics_service import AnalyticsService
 logger = logging.getLogger(__name__)
 
 
+def _load_active_config(config_id: int) -> Optional[ClientConfig]:
+    """Load an active config detached from its session, so no connection is held while it is scanned"""
+    with short_session() as db:
+        cfg = db.query(ClientConfig).filter(ClientConfig.id == config_id, ClientConfig.is_active == True).first()
+        if cfg:
+            db.expunge(cfg)
+    return cfg
+
+
+def _scan_client_config(loop: asyncio.AbstractEventLoop, cfg: ClientConfig, errors: List[str]) -> int:
+    """Scan one client config, store new posts, queue reply generation and notify the client; returns posts stored"""
+    client_start_time = time.monotonic()
+    client_posts = 0
+    
+    try:
+        # Notify client-specific scan started
+        loop.run_until_complete(WebSocketNotifier.notify_scan_started(cfg.client_id))
+        
+        # Parse and validate configuration
+        subs = (cfg.reddit_subreddits or "").split(",") if cfg.reddit_subreddits else []
+        keys = (cfg.keywords or "").split(",") if cfg.keywords else []
+        subs = [s.strip() for s in subs if s.strip()]
+        keys = [k.strip() for k in keys if k.strip()]
+        
+        if not subs or not keys:
+            logger.warning(f"Client {cfg.client_id} has incomplete configuration (subs: {len(subs)}, keys: {len(keys)})")
+            return client_posts
+
+        logger.info(f"Scanning for client {cfg.client_id}: {len(subs)} subreddits, {len(keys)} keywords")
+
+        # Find matching posts with enhanced error handling
+        try:
+            matches = find_matching_posts(subs, keys)
+            logger.info(f"Found {len(matches)} matches for client {cfg.client_id}")
+            
+        except RedditAPIError as e:
+            error_msg = f"Reddit API error for client {cfg.client_id}: {e.message}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+            
+            # Notify client about the error
+            try:
+                loop.run_until_complete(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
+                    "status": "error",
+                    "message": error_msg,
+                    "posts_created": 0
+                }))
+            except Exception:
+                pass
+            
+            return client_posts
+        
+        # Build post rows for every match, deduplicated by Reddit id
+        post_rows = {}
+        for m in matches:
+            if m["id"] in post_rows:
+                continue
+            post_rows[m["id"]] = {
+                "client_id": cfg.client_id,
+                "subreddit": m["subreddit"],
+                "reddit_post_id": m["id"],
+                "title": m["title"],
+                "url": m["url"],
+                "author": m["author"],
+                "content": m.get("content"),
+                "keywords_matched": m.get("keywords_matched"),
+                "score": m.get("score", 0),
+                "num_comments": m.get("num_comments", 0),
+            }
+
+        # Insert all posts in one statement and let the unique constraint skip
+        # the ones already stored; RETURNING only reports rows actually inserted.
+        # The session is only opened now, after the Reddit fetch
+        rows = []
+        if post_rows:
+            with short_session() as db:
+                inserted = db.execute(
+                    pg_insert(MatchedPost)
+                    .on_conflict_do_nothing(index_elements=[MatchedPost.client_id, MatchedPost.reddit_post_id])
+                    .returning(MatchedPost.id, MatchedPost.reddit_post_id, MatchedPost.created_at),
+                    list(post_rows.values()),
+                ).all()
+                for post_id, reddit_id, created_at in inserted:
+                    row = post_rows[reddit_id]
+                    row["id"] = post_id
+                    row["created_at"] = created_at
+                    rows.append(row)
+                
+                # Track analytics for the whole batch in one insert; the savepoint keeps
+                # a tracking failure from discarding the posts
+                if rows:
+                    try:
+                        tracked_at = datetime.utcnow()
+                        with db.begin_nested():
+                            db.execute(insert(AnalyticsEvent), [
+                                {
+                                    "client_id": cfg.client_id,
+                                    "event_type": "post_matched",
+                                    "data": {"post_id": row["id"]},
+                                    "created_at": tracked_at,
+                                }
+                                for row in rows
+                            ])
+                    except Exception as e:
+                        logger.warning(f"Analytics tracking failed for client {cfg.client_id}: {e}")
+            logger.info(f"Stored {len(rows)} new posts for client {cfg.client_id}")
+
+        if rows:
+            client_posts += len(rows)
+
+            # One message per client for the whole batch instead of one per row
+            try:
+                loop.run_until_complete(WebSocketNotifier.notify_new_posts_bulk(cfg.client_id, [
+                    {
+                        "id": row["id"],
+                        "title": row["title"],
+                        "subreddit": row["subreddit"],
+                        "url": row["url"],
+                        "keywords_matched": row["keywords_matched"],
+                        "score": row["score"],
+                        "num_comments": row["num_comments"],
+                        "author": row["author"],
+                        "created_at": row["created_at"].isoformat() if row["created_at"] else None
+                    }
+                    for row in rows
+                ]))
+            except Exception as e:
+                logger.warning(f"Failed to send new post notifications: {e}")
+
+            # Reply generation is the slow part, so each post gets its own task
+            group(
+                generate_replies_for_post.s(row["id"], cfg.client_id, row["title"]) for row in rows
+            ).apply_async()
+
+        # Send client scan completion notification
+        client_duration = time.monotonic() - client_start_time
+        try:
+            loop.run_until_complete(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
+                "status": "success",
+                "posts_created": client_posts,
+                "duration_seconds": client_duration,
+                "errors": len([e for e in errors if f"client {cfg.client_id}" in e])
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to send scan completion notification: {e}")
+            
+    except Exception as e:
+        error_msg = f"Error processing client {cfg.client_id}: {e}"
+        logger.error(error_msg)
+        errors.append(error_msg)
+        
+        # Notify client about error
+        try:
+            loop.run_until_complete(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
+                "status": "error",
+                "message": str(e),
+                "posts_created": client_posts
+            }))
+        except Exception:
+            pass
+    
+    return client_posts
+
+
 @celery_app.task(name="app.tasks.reddit_tasks.scan_reddit", bind=True, max_retries=3)
 def scan_reddit(self):
     """Enhanced Reddit scanning with comprehensive error handling and real-time updates"""
-    db: Session = SessionLocal()
     created_posts: int = 0
-    created_responses: int = 0
     errors: List[str] = []
-    scan_start_time = datetime.utcnow()
+    scan_start_time = time.monotonic()
+    # One event loop for the whole task instead of a fresh loop per notification
+    loop = asyncio.new_event_loop()
     
     try:
         logger.info("Starting Reddit scan")
         
-        # Test Reddit connection first
-        connection_status = test_reddit_connection()
+        # Test Reddit connection first (cached briefly so scans don't spend API quota on it)
+        connection_status = get_cached_reddit_connection()
         if connection_status["status"] != "success":
             error_msg = f"Reddit API connection failed: {connection_status['message']}"
             logger.error(error_msg)
             
             # Notify all clients about the connection issue
             try:
-                asyncio.run(WebSocketNotifier.notify_system_status("error", error_msg))
+                loop.run_until_complete(WebSocketNotifier.notify_system_status("error", error_msg))
             except Exception as e:
                 logger.error(f"Failed to send system status notification: {e}")
             
@@ -49,202 +217,31 @@ def scan_reddit(self):
         
         # Notify scan started
         try:
-            asyncio.run(WebSocketNotifier.notify_scan_started())
+            loop.run_until_complete(WebSocketNotifier.notify_scan_started())
         except Exception as e:
             logger.warning(f"Failed to send scan started notification: {e}")
         
-        active_configs: List[ClientConfig] = db.query(ClientConfig).filter(ClientConfig.is_active == True).all()
-        logger.info(f"Found {len(active_configs)} active client configurations")
+        # Read only the ids up front and reload each config in its own short session,
+        # so no connection is held through the Reddit, notification and reply I/O
+        with short_session() as db:
+            config_ids = db.execute(
+                select(ClientConfig.id).where(ClientConfig.is_active == True).order_by(ClientConfig.id)
+            ).scalars().all()
         
-        for cfg in active_configs:
-            client_start_time = datetime.utcnow()
-            client_posts = 0
-            client_responses = 0
-            
-            try:
-                # Notify client-specific scan started
-                asyncio.run(WebSocketNotifier.notify_scan_started(cfg.client_id))
-                
-                # Parse and validate configuration
-                subs = (cfg.reddit_subreddits or "").split(",") if cfg.reddit_subreddits else []
-                keys = (cfg.keywords or "").split(",") if cfg.keywords else []
-                subs = [s.strip() for s in subs if s.strip()]
-                keys = [k.strip() for k in keys if k.strip()]
-                
-                if not subs or not keys:
-                    logger.warning(f"Client {cfg.client_id} has incomplete configuration (subs: {len(subs)}, keys: {len(keys)})")
-                    continue
-
-                logger.info(f"Scanning for client {cfg.client_id}: {len(subs)} subreddits, {len(keys)} keywords")
-
-                # Optimize: Only fetch post IDs, not full objects
-                existing_ids = set(x[0] for x in db.query(MatchedPost.reddit_post_id).filter(MatchedPost.client_id == cfg.client_id).all())
-                logger.debug(f"Client {cfg.client_id} has {len(existing_ids)} existing posts")
-                
-                # Find matching posts with enhanced error handling
-                try:
-                    matches = find_matching_posts(subs, keys, existing_ids)
-                    logger.info(f"Found {len(matches)} new matches for client {cfg.client_id}")
-                    
-                except RedditAPIError as e:
-                    error_msg = f"Reddit API error for client {cfg.client_id}: {e.message}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    
-                    # Notify client about the error
-                    try:
-                        asyncio.run(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
-                            "status": "error",
-                            "message": error_msg,
-                            "posts_created": 0,
-                            "responses_created": 0
-                        }))
-                    except Exception:
-                        pass
-                    
-                    continue
-                
-                # Process each match
-                for m in matches:
-                    try:
-                        if m["id"] in existing_ids:
-                            continue
-                            
-                        # Create post record
-                        post = MatchedPost(
-                            client_id=cfg.client_id,
-                            subreddit=m["subreddit"],
-                            reddit_post_id=m["id"],
-                            title=m["title"],
-                            url=m["url"],
-                            author=m["author"],
-                            content=m.get("content"),
-                            keywords_matched=m.get("keywords_matched"),
-                            score=m.get("score", 0),
-                            num_comments=m.get("num_comments", 0),
-                        )
-                        db.add(post)
-                        db.flush()
-                        created_posts += 1
-                        client_posts += 1
-
-                        # Send immediate notification about new post
-                        try:
-                            asyncio.run(WebSocketNotifier.notify_new_post(cfg.client_id, {
-                                "id": post.id,
-                                "title": post.title,
-                                "subreddit": post.subreddit,
-                                "url": post.url,
-                                "keywords_matched": post.keywords_matched,
-                                "score": post.score,
-                                "num_comments": post.num_comments,
-                                "author": post.author,
-                                "created_at": post.created_at.isoformat() if post.created_at else None
-                            }))
-                        except Exception as e:
-                            logger.warning(f"Failed to send new post notification: {e}")
-
-                        # Fetch context with error handling
-                        context_text = ""
-                        try:
-                            import anyio
-                            google_results = anyio.run(fetch_google_results, post.title, 3)
-                            youtube_results = anyio.run(fetch_youtube_results, post.title, 3)
-                            
-                            context_text = "\n".join([
-                                *(f"Google: {r.get('title', '')} {r.get('link', r.get('url', ''))}" for r in google_results),
-                                *(f"YouTube: {r.get('title', '')} {r.get('url', '')}" for r in youtube_results),
-                            ])
-                        except Exception as e:
-                            logger.warning(f"Context fetching failed for post {post.id}: {e}")
-
-                        # Generate responses with quality scoring
-                        try:
-                            suggestions = generate_reddit_replies(
-                                prompt=post.title, 
-                                context=context_text, 
-                                num=3
-                            )
-                            
-                            for suggestion_data in suggestions:
-                                resp = AIResponse(
-                                    post_id=post.id,
-                                    client_id=cfg.client_id,
-                                    content=suggestion_data['content'],
-                                    score=suggestion_data['score'],
-                                )
-                                db.add(resp)
-                                created_responses += 1
-                                client_responses += 1
-
-                                # Send immediate notification about new response
-                                try:
-                                    asyncio.run(WebSocketNotifier.notify_new_response(cfg.client_id, {
-                                        "id": resp.id,
-                                        "post_id": post.id,
-                                        "content": suggestion_data['content'],
-                                        "score": suggestion_data['score'],
-                                        "quality_breakdown": suggestion_data.get('quality_breakdown', {}),
-                                        "created_at": resp.created_at.isoformat() if resp.created_at else None
-                                    }))
-                                except Exception as e:
-                                    logger.warning(f"Failed to send new response notification: {e}")
-                                    
-                        except Exception as e:
-                            logger.error(f"AI response generation failed for post {post.id}: {e}")
-                            errors.append(f"AI response generation failed: {e}")
-
-                        # Track analytics
-                        try:
-                            analytics_service = AnalyticsService(db)
-                            analytics_service.track_event(cfg.client_id, "post_matched", {"post_id": post.id})
-                        except Exception as e:
-                            logger.warning(f"Analytics tracking failed for post {post.id}: {e}")
-
-                        db.commit()
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing match {m.get('id', 'unknown')}: {e}")
-                        errors.append(f"Error processing match: {e}")
-                        db.rollback()
-                        continue
-
-                # Send client scan completion notification
-                client_duration = (datetime.utcnow() - client_start_time).total_seconds()
-                try:
-                    asyncio.run(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
-                        "status": "success",
-                        "posts_created": client_posts,
-                        "responses_created": client_responses,
-                        "duration_seconds": client_duration,
-                        "errors": len([e for e in errors if f"client {cfg.client_id}" in e])
-                    }))
-                except Exception as e:
-                    logger.warning(f"Failed to send scan completion notification: {e}")
-                    
-            except Exception as e:
-                error_msg = f"Error processing client {cfg.client_id}: {e}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                
-                # Notify client about error
-                try:
-                    asyncio.run(WebSocketNotifier.notify_scan_completed(cfg.client_id, {
-                        "status": "error",
-                        "message": str(e),
-                        "posts_created": client_posts,
-                        "responses_created": client_responses
-                    }))
-                except Exception:
-                    pass
-                
+        scanned_configs = 0
+        for config_id in config_ids:
+            cfg = _load_active_config(config_id)
+            if cfg is None:
                 continue
+            scanned_configs += 1
+            created_posts += _scan_client_config(loop, cfg, errors)
+        logger.info(f"Scanned {scanned_configs} active client configurations")
 
         # Send overall scan completion notification
-        scan_duration = (datetime.utcnow() - scan_start_time).total_seconds()
+        scan_duration = time.monotonic() - scan_start_time
         try:
-            asyncio.run(WebSocketNotifier.notify_system_status("success", 
-                f"Reddit scan completed: {created_posts} posts, {created_responses} responses in {scan_duration:.1f}s"))
+            loop.run_until_complete(WebSocketNotifier.notify_system_status("success", 
+                f"Reddit scan completed: {created_posts} posts in {scan_duration:.1f}s, replies are being generated"))
         except Exception as e:
             logger.warning(f"Failed to send system status notification: {e}")
             
@@ -259,27 +256,159 @@ def scan_reddit(self):
         
         # Send error notification
         try:
-            asyncio.run(WebSocketNotifier.notify_system_status("error", f"Reddit scan failed: {e}"))
+            loop.run_until_complete(WebSocketNotifier.notify_system_status("error", f"Reddit scan failed: {e}"))
         except Exception:
             pass
             
     finally:
-        db.close()
+        loop.close()
 
     result = {
         "created_posts": created_posts,
-        "created_responses": created_responses,
         "errors": errors,
-        "scan_duration": (datetime.utcnow() - scan_start_time).total_seconds()
+        "scan_duration": time.monotonic() - scan_start_time
     }
     
     logger.info(f"Reddit scan completed: {result}")
     return result
 
+
+@celery_app.task(name="app.tasks.reddit_tasks.scan_client", bind=True, max_retries=3)
+def scan_client(self, config_id: int):
+    """Scan a single client config so clients can be processed in parallel across workers"""
+    errors: List[str] = []
+    client_posts = 0
+    loop = asyncio.new_event_loop()
+    
+    try:
+        connection_status = get_cached_reddit_connection()
+        if connection_status["status"] != "success":
+            error_msg = f"Reddit API connection failed: {connection_status['message']}"
+            logger.error(error_msg)
+            raise self.retry(exc=RedditAPIError(error_msg), countdown=60 * (2 ** self.request.retries))
+        
+        cfg = _load_active_config(config_id)
+        if cfg:
+            client_posts = _scan_client_config(loop, cfg, errors)
+        else:
+            logger.info(f"Config {config_id} no longer active, skipping scan")
+    
+    finally:
+        loop.close()
+    
+    return {
+        "config_id": config_id,
+        "created_posts": client_posts,
+        "errors": errors
+    }
+
+
+@celery_app.task(name="app.tasks.reddit_tasks.finalize_scan")
+def finalize_scan(results: List[dict]):
+    """Aggregate the per-client scan results of a fan-out and announce completion"""
+    created_posts = sum(r.get("created_posts", 0) for r in results if r)
+    errors = [e for r in results if r for e in r.get("errors", [])]
+    
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(WebSocketNotifier.notify_system_status("success",
+            f"Reddit scan completed: {created_posts} posts across {len(results)} configs, replies are being generated"))
+    except Exception as e:
+        logger.warning(f"Failed to send system status notification: {e}")
+    finally:
+        loop.close()
+    
+    result = {
+        "scanned_configs": len(results),
+        "created_posts": created_posts,
+        "errors": errors
+    }
+    logger.info(f"Reddit scan fan-out completed: {result}")
+    return result
+
+
+@celery_app.task(name="app.tasks.reddit_tasks.generate_replies_for_post")
+def generate_replies_for_post(post_id: int, client_id: int, title: str):
+    """Fetch context and generate AI replies for one stored post, then notify the client"""
+    loop = asyncio.new_event_loop()
+    
+    try:
+        # Fetch context with error handling
+        context_text = ""
+        try:
+            # gather has to be created inside the loop that runs it
+            async def _fetch_context():
+                return await asyncio.gather(
+                    fetch_google_results(title, 3),
+                    fetch_youtube_results(title, 3),
+                )
+            
+            google_results, youtube_results = loop.run_until_complete(_fetch_context())
+            
+            context_text = "\n".join([
+                *(f"Google: {r.get('title', '')} {r.get('link', r.get('url', ''))}" for r in google_results),
+                *(f"YouTube: {r.get('title', '')} {r.get('url', '')}" for r in youtube_results),
+            ])
+        except Exception as e:
+            logger.warning(f"Context fetching failed for post {post_id}: {e}")
+        
+        # Generate responses with quality scoring
+        try:
+            suggestions = generate_reddit_replies(
+                prompt=title, 
+                context=context_text, 
+                num=3
+            )
+        except Exception as e:
+            logger.error(f"AI response generation failed for post {post_id}: {e}")
+            return {"post_id": post_id, "created_responses": 0, "error": str(e)}
+        
+        if not suggestions:
+            return {"post_id": post_id, "created_responses": 0}
+        
+        response_rows = [
+            {
+                "post_id": post_id,
+                "client_id": client_id,
+                "content": suggestion_data['content'],
+                "score": suggestion_data['score'],
+            }
+            for suggestion_data in suggestions
+        ]
+        # Only hold a connection for the insert, not the context and OpenAI calls
+        with short_session() as db:
+            inserted = db.execute(
+                insert(AIResponse).returning(
+                    AIResponse.id, AIResponse.created_at, sort_by_parameter_order=True
+                ),
+                response_rows,
+            ).all()
+        
+        try:
+            loop.run_until_complete(WebSocketNotifier.notify_new_responses_bulk(client_id, [
+                {
+                    "id": resp_id,
+                    "post_id": post_id,
+                    "content": suggestion_data['content'],
+                    "score": suggestion_data['score'],
+                    "quality_breakdown": suggestion_data.get('quality_breakdown', {}),
+                    "created_at": created_at.isoformat() if created_at else None
+                }
+                for suggestion_data, (resp_id, created_at) in zip(suggestions, inserted)
+            ]))
+        except Exception as e:
+            logger.warning(f"Failed to send new response notifications: {e}")
+        
+        return {"post_id": post_id, "created_responses": len(response_rows)}
+    
+    finally:
+        loop.close()
+
 @celery_app.task(name="app.tasks.reddit_tasks.update_performance_metrics")
 def update_performance_metrics():
     """Update daily performance metrics for all clients"""
     db: Session = SessionLocal()
+    loop = asyncio.new_event_loop()
     try:
         analytics_service = AnalyticsService(db)
         
@@ -295,7 +424,7 @@ def update_performance_metrics():
                 
                 # Send analytics update notification
                 summary = analytics_service.get_dashboard_summary(client_id)
-                asyncio.run(WebSocketNotifier.notify_analytics_update(client_id, summary))
+                loop.run_until_complete(WebSocketNotifier.notify_analytics_update(client_id, summary))
                 
             except Exception as e:
                 print(f"Error updating metrics for client {client_id}: {e}")
@@ -304,6 +433,7 @@ def update_performance_metrics():
         
     finally:
         db.close()
+        loop.close()
 
 
 @celery_app.task(name="app.tasks.reddit_tasks.generate_trend_analysis")
@@ -318,68 +448,67 @@ def generate_trend_analysis():
         # Get data for the past week
         week_start = datetime.utcnow() - timedelta(days=7)
         
-        # Get all active clients
-        active_configs = db.query(ClientConfig).filter(ClientConfig.is_active == True).all()
-        client_ids = list(set(cfg.client_id for cfg in active_configs))
+        # Aggregate every active client in one grouped query per dimension
+        active_client_ids = select(ClientConfig.client_id).where(ClientConfig.is_active == True)
+        recent_posts = and_(
+            MatchedPost.client_id.in_(active_client_ids),
+            MatchedPost.created_at >= week_start
+        )
         
-        trends_created = 0
+        # Analyze keyword trends, skipping low-activity keywords in SQL
+        keyword_activity = db.query(
+            MatchedPost.client_id,
+            MatchedPost.keywords_matched,
+            func.count(MatchedPost.id).label('count'),
+            func.avg(MatchedPost.score).label('avg_score'),
+            func.avg(MatchedPost.num_comments).label('avg_comments')
+        ).filter(
+            recent_posts,
+            MatchedPost.keywords_matched.isnot(None),
+            MatchedPost.keywords_matched != ''
+        ).group_by(
+            MatchedPost.client_id, MatchedPost.keywords_matched
+        ).having(func.count(MatchedPost.id) >= 3).all()
         
-        for client_id in client_ids:
+        # Analyze subreddit trends
+        subreddits_by_client: Dict[int, List[str]] = {}
+        for client_id, subreddit in db.query(
+            MatchedPost.client_id,
+            MatchedPost.subreddit
+        ).filter(
+            recent_posts,
+            MatchedPost.subreddit.isnot(None)
+        ).group_by(MatchedPost.client_id, MatchedPost.subreddit).all():
+            subreddits_by_client.setdefault(client_id, []).append(subreddit)
+        
+        # Create trend analysis entries
+        trend_rows = []
+        for client_id, keywords, count, avg_score, avg_comments in keyword_activity:
+            activity_score = (count * 10) + (float(avg_score or 0) / 10) + (float(avg_comments or 0) / 5)
+            
+            # Calculate growth rate (simplified - would need historical data for accurate calculation)
+            growth_rate = min(100, max(-100, (count - 5) * 10))  # Placeholder calculation
+            
+            trend_rows.append({
+                "client_id": client_id,
+                "topic": keywords,
+                "keywords": keywords.split(','),
+                "subreddits": subreddits_by_client.get(client_id, []),
+                "activity_score": activity_score,
+                "growth_rate": growth_rate,
+                "sentiment_score": min(100, max(0, float(avg_score or 0) * 2)),  # Simplified sentiment
+                "week_start": week_start
+            })
+        
+        trends_created = len(trend_rows)
+        if trend_rows:
             try:
-                # Analyze keyword trends
-                keyword_activity = db.query(
-                    MatchedPost.keywords_matched,
-                    func.count(MatchedPost.id).label('count'),
-                    func.avg(MatchedPost.score).label('avg_score'),
-                    func.avg(MatchedPost.num_comments).label('avg_comments')
-                ).filter(
-                    and_(
-                        MatchedPost.client_id == client_id,
-                        MatchedPost.created_at >= week_start
-                    )
-                ).group_by(MatchedPost.keywords_matched).all()
-                
-                # Analyze subreddit trends
-                subreddit_activity = db.query(
-                    MatchedPost.subreddit,
-                    func.count(MatchedPost.id).label('count'),
-                    func.avg(MatchedPost.score).label('avg_score')
-                ).filter(
-                    and_(
-                        MatchedPost.client_id == client_id,
-                        MatchedPost.created_at >= week_start
-                    )
-                ).group_by(MatchedPost.subreddit).all()
-                
-                # Create trend analysis entries
-                for keywords, count, avg_score, avg_comments in keyword_activity:
-                    if not keywords or count < 3:  # Skip low-activity keywords
-                        continue
-                    
-                    activity_score = (count * 10) + (float(avg_score or 0) / 10) + (float(avg_comments or 0) / 5)
-                    
-                    # Calculate growth rate (simplified - would need historical data for accurate calculation)
-                    growth_rate = min(100, max(-100, (count - 5) * 10))  # Placeholder calculation
-                    
-                    trend = TrendAnalysis(
-                        client_id=client_id,
-                        topic=keywords,
-                        keywords=keywords.split(','),
-                        subreddits=[sub for sub, _, _ in subreddit_activity if sub],
-                        activity_score=activity_score,
-                        growth_rate=growth_rate,
-                        sentiment_score=min(100, max(0, float(avg_score or 0) * 2)),  # Simplified sentiment
-                        week_start=week_start
-                    )
-                    
-                    db.add(trend)
-                    trends_created += 1
-                
+                db.execute(insert(TrendAnalysis), trend_rows)
                 db.commit()
-                
             except Exception as e:
-                print(f"Error generating trends for client {client_id}: {e}")
+                print(f"Error generating trends: {e}")
                 db.rollback()
+                trends_created = 0
         
         return {"trends_created": trends_created}
         
@@ -387,6 +516,23 @@ def generate_trend_analysis():
         db.close()
 
 
+CLEANUP_BATCH_SIZE = 5000
+
+
+def _delete_in_batches(db: Session, model, cutoff: datetime) -> int:
+    """Delete rows created before cutoff in bounded batches so each transaction stays short"""
+    total_deleted = 0
+    while True:
+        batch_ids = select(model.id).where(model.created_at < cutoff).limit(CLEANUP_BATCH_SIZE)
+        deleted = db.execute(
+            delete(model).where(model.id.in_(batch_ids)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        total_deleted += deleted
+        if deleted < CLEANUP_BATCH_SIZE:
+            return total_deleted
+
+
 @celery_app.task(name="app.tasks.reddit_tasks.cleanup_old_data")
 def cleanup_old_data():
     """Clean up old data to maintain database performance"""
@@ -396,25 +542,17 @@ def cleanup_old_data():
         
         # Delete analytics events older than 90 days
         ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        old_events = db.query(AnalyticsEvent).filter(AnalyticsEvent.created_at < ninety_days_ago)
-        events_deleted = old_events.count()
-        old_events.delete()
+        events_deleted = _delete_in_batches(db, AnalyticsEvent, ninety_days_ago)
         
         # Delete performance metrics older than 180 days
         six_months_ago = datetime.utcnow() - timedelta(days=180)
         from app.models.analytics import PerformanceMetrics
-        old_metrics = db.query(PerformanceMetrics).filter(PerformanceMetrics.created_at < six_months_ago)
-        metrics_deleted = old_metrics.count()
-        old_metrics.delete()
+        metrics_deleted = _delete_in_batches(db, PerformanceMetrics, six_months_ago)
         
         # Delete trend analysis older than 1 year
         one_year_ago = datetime.utcnow() - timedelta(days=365)
         from app.models.analytics import TrendAnalysis
-        old_trends = db.query(TrendAnalysis).filter(TrendAnalysis.created_at < one_year_ago)
-        trends_deleted = old_trends.count()
-        old_trends.delete()
-        
-        db.commit()
+        trends_deleted = _delete_in_batches(db, TrendAnalysis, one_year_ago)
         
         return {
             "events_deleted": events_deleted,
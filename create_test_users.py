@@ -5,13 +5,20 @@ Script to create test users for authentication testing
 
 import requests
 import json
+from requests.adapters import HTTPAdapter
 
 API_BASE_URL = "http://localhost:8001"
 
+# Reuse one keep-alive connection for all registration calls
+session = requests.Session()
+session.headers.update({"Content-Type": "application/json"})
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 def create_admin_user():
     """Create an admin user"""
     try:
-        response = requests.post(f"{API_BASE_URL}/api/auth/register", json={
+        response = session.post(f"{API_BASE_URL}/api/auth/register", json={
             "email": "admin@example.com",
             "password": "admin123",
             "role": "admin"
@@ -34,7 +41,7 @@ def create_admin_user():
 def create_client_user():
     """Create a user with a client"""
     try:
-        response = requests.post(f"{API_BASE_URL}/api/auth/register", json={
+        response = session.post(f"{API_BASE_URL}/api/auth/register", json={
             "email": "client@example.com",
             "password": "client123",
             "role": "client",
@@ -63,7 +70,7 @@ def update_existing_user_with_client():
     """Update the existing test user to have a client"""
     try:
         # First create a client
-        client_response = requests.post(f"{API_BASE_URL}/api/auth/register", json={
+        client_response = session.post(f"{API_BASE_URL}/api/auth/register", json={
             "email": "temp@example.com",
             "password": "temp123",
             "role": "client",
@@ -51,6 +51,24 @@ const RealTimeNotifications: React.FC = () => {
           data: message.data
         }
       
+      case 'new_posts':
+        return {
+          id,
+          type: 'success',
+          message: `${message.data.count} new post${message.data.count !== 1 ? 's' : ''} matched`,
+          timestamp,
+          data: message.data
+        }
+      
+      case 'new_responses':
+        return {
+          id,
+          type: 'info',
+          message: `${message.data.count} new AI response${message.data.count !== 1 ? 's' : ''} generated`,
+          timestamp,
+          data: message.data
+        }
+      
       case 'response_copied':
         return {
           id,
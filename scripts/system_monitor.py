@@ -5,16 +5,21 @@ Monitors system health, performance, and provides diagnostics
 """
 
 import asyncio
-import json
+import orjson
+import threading
 import time
 import psutil
 import requests
 import redis
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import argparse
+import signal
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 # Add the app directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -22,11 +27,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 try:
     from app.core.config import settings
     from app.db.session import SessionLocal
-    from app.models.analytics import AnalyticsEvent, PerformanceMetrics
     from app.models.post import MatchedPost, AIResponse
     from app.models.client import Client
     from app.models.config import ClientConfig
-    from sqlalchemy import func
+    from sqlalchemy import func, literal_column, select, text
 except ImportError as e:
     print(f"Warning: Could not import app modules: {e}")
     print("Running in standalone mode with limited functionality")
@@ -34,48 +38,159 @@ except ImportError as e:
 
 
 class SystemMonitor:
-    def __init__(self):
+    # Seconds a single check may take before it is reported as timed out
+    CHECK_TIMEOUT = 5.0
+    # How often (seconds) the background thread samples CPU, memory and disk
+    PSUTIL_SAMPLE_INTERVAL = 5.0
+    # How long (seconds) each check's last successful result is served from cache
+    CHECK_TTLS = {
+        "system_resources": 2.0,
+        "docker_services": 10.0,
+        "api_health": 5.0,
+        "redis_health": 5.0,
+        "database_health": 10.0,
+        "celery_health": 10.0,
+        "performance_metrics": 30.0,
+    }
+    # In watch mode a check is only re-run every N refreshes; slow-changing data waits longer
+    CHECK_CADENCE = {
+        "system_resources": 1,
+        "api_health": 1,
+        "redis_health": 2,
+        "celery_health": 5,
+        "docker_services": 5,
+        "database_health": 10,
+        "performance_metrics": 10,
+    }
+    
+    def __init__(self, disk_path: str = "/", verbose: bool = False):
         self.api_base = "http://localhost/api"
+        self.disk_path = disk_path
+        self.verbose = verbose
+        self._celery_app = None
+        self.redis_pool = None
         self.redis_client = None
-        self.db = None
+        
+        # Checks run concurrently in these threads
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health-check")
+        
+        # Keep-alive HTTP session shared by the API probes
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        # Paths whose server rejected HEAD; these are probed with a body-less GET instead
+        self._head_unsupported = set()
+        
+        self._cache: Dict[str, tuple] = {}
+        
+        # Resource usage is sampled at its own rate by a daemon thread; checks read the
+        # latest snapshot. Priming cpu_percent makes each sample cover the interval since the last
+        psutil.cpu_percent(interval=None)
+        self._latest_resources = None
+        self._stop_sampling = threading.Event()
+        threading.Thread(target=self._sample_loop, name="psutil-sampler", daemon=True).start()
         
         # Initialize connections
         self._init_redis()
         self._init_db()
+        self._init_celery()
     
     def _init_redis(self):
-        """Initialize Redis connection"""
+        """Initialize a pooled Redis client so concurrent checks don't share one socket"""
+        pool_options = {
+            "max_connections": 32,
+            "socket_timeout": 2,
+            "socket_connect_timeout": 2,
+            "health_check_interval": 30,
+        }
         try:
             if settings:
-                self.redis_client = redis.from_url(settings.redis_url)
+                self.redis_pool = redis.ConnectionPool.from_url(settings.redis_url, **pool_options)
+                self.redis_client = redis.Redis(connection_pool=self.redis_pool)
                 self.redis_client.ping()
                 print("✅ Redis connection established")
             else:
-                self.redis_client = redis.Redis(host='localhost', port=6379, db=0)
+                self.redis_pool = redis.ConnectionPool(host='localhost', port=6379, db=0, **pool_options)
+                self.redis_client = redis.Redis(connection_pool=self.redis_pool)
                 self.redis_client.ping()
                 print("✅ Redis connection established (default config)")
         except Exception as e:
             print(f"❌ Redis connection failed: {e}")
     
+    def _init_celery(self):
+        """Create the Celery app once so inspect broadcasts reuse its broker connection"""
+        try:
+            from celery import Celery
+            
+            if settings:
+                self._celery_app = Celery(
+                    "redditbot",
+                    broker=settings.celery_broker_url,
+                    backend=settings.celery_result_backend,
+                )
+            else:
+                self._celery_app = Celery(
+                    "redditbot",
+                    broker="redis://localhost:6379/1",
+                    backend="redis://localhost:6379/2",
+                )
+            self._celery_app.conf.broker_pool_limit = 10
+            self._celery_app.conf.broker_connection_timeout = 2
+        except Exception as e:
+            print(f"❌ Celery app setup failed: {e}")
+    
     def _init_db(self):
-        """Initialize database connection"""
+        """Test the database connection; checks open their own sessions when they run"""
         try:
             if settings:
-                self.db = SessionLocal()
-                # Test connection
-                self.db.execute("SELECT 1")
+                with SessionLocal() as db:
+                    db.execute(text("SELECT 1"))
                 print("✅ Database connection established")
             else:
                 print("⚠️  Database connection not available (app modules not imported)")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
     
+    def close(self):
+        """Release pooled connections and worker threads"""
+        self._stop_sampling.set()
+        if self.redis_pool:
+            self.redis_pool.disconnect()
+        self.http.close()
+        if self._celery_app:
+            try:
+                self._celery_app.close()
+            except Exception:
+                pass
+        self._executor.shutdown(wait=False)
+    
+    def _sample_resources(self) -> Dict[str, Any]:
+        """Take a non-blocking resource snapshot"""
+        return {
+            "cpu": psutil.cpu_percent(interval=None),
+            "memory": psutil.virtual_memory(),
+            "disk": psutil.disk_usage(self.disk_path),
+        }
+    
+    def _sample_loop(self):
+        """Refresh the resource snapshot until close() is called"""
+        # The first sample comes after a short delay so cpu_percent has a window to measure
+        interval = 1.0
+        while not self._stop_sampling.wait(interval):
+            try:
+                self._latest_resources = self._sample_resources()
+            except Exception as e:
+                print(f"❌ Resource sampling failed: {e}")
+            interval = self.PSUTIL_SAMPLE_INTERVAL
+    
     def check_system_resources(self) -> Dict[str, Any]:
-        """Check system resource usage"""
+        """Check system resource usage from the latest background sample"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            sample = self._latest_resources or self._sample_resources()
+            cpu_percent = sample["cpu"]
+            memory = sample["memory"]
+            disk = sample["disk"]
             
             return {
                 "cpu_usage": cpu_percent,
@@ -93,30 +208,33 @@ class SystemMonitor:
         try:
             import subprocess
             
-            # Get running containers
-            result = subprocess.run(
+            # Get running containers, parsing each service line as it is emitted
+            services = []
+            service_fields = itemgetter("Service", "State", "Status")
+            with subprocess.Popen(
                 ["docker-compose", "ps", "--format", "json"],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
                 cwd=os.path.dirname(os.path.dirname(__file__))
-            )
-            
-            if result.returncode != 0:
-                return {"error": "Docker Compose not available", "status": "error"}
-            
-            services = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
+            ) as proc:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if not line:
+                        continue
                     try:
-                        service = json.loads(line)
-                        services.append({
-                            "name": service.get("Service", "unknown"),
-                            "state": service.get("State", "unknown"),
-                            "status": service.get("Status", "unknown"),
-                            "healthy": service.get("State") == "running"
-                        })
-                    except json.JSONDecodeError:
+                        name, state, status = service_fields(orjson.loads(line))
+                    except (orjson.JSONDecodeError, KeyError, TypeError):
                         continue
+                    services.append({
+                        "name": name,
+                        "state": state,
+                        "status": status,
+                        "healthy": state == "running"
+                    })
+            
+            if proc.returncode != 0:
+                return {"error": "Docker Compose not available", "status": "error"}
             
             healthy_count = sum(1 for s in services if s["healthy"])
             total_count = len(services)
@@ -130,15 +248,28 @@ class SystemMonitor:
         except Exception as e:
             return {"error": str(e), "status": "error"}
     
+    def _probe(self, path: str) -> requests.Response:
+        """Fetch only the status line and headers of an API endpoint"""
+        url = f"{self.api_base}{path}"
+        if path not in self._head_unsupported:
+            response = self.http.head(url, timeout=(1, 3), allow_redirects=True)
+            if response.status_code not in (405, 501):
+                return response
+            self._head_unsupported.add(path)
+        
+        # GET routes don't answer HEAD in FastAPI; stream so the body is never read
+        with self.http.get(url, timeout=(1, 3), stream=True) as response:
+            return response
+    
     def check_api_health(self) -> Dict[str, Any]:
         """Check API endpoint health"""
         try:
             # Test health endpoint
-            response = requests.get(f"{self.api_base}/health", timeout=10)
+            response = self._probe("/health")
             health_status = response.status_code == 200
             
             # Test WebSocket stats endpoint
-            ws_response = requests.get(f"{self.api_base}/ws/stats", timeout=10)
+            ws_response = self._probe("/ws/stats")
             ws_status = ws_response.status_code == 200
             
             return {
@@ -181,30 +312,47 @@ class SystemMonitor:
         except Exception as e:
             return {"error": str(e), "status": "error"}
     
-    def check_database_health(self) -> Dict[str, Any]:
+    @staticmethod
+    def _estimate_rows(table: str):
+        """Planner row estimate for a table, an O(1) catalog lookup instead of a full count"""
+        # reltuples is -1 until the table has been vacuumed/analyzed once
+        return (
+            select(literal_column("GREATEST(reltuples, 0)::bigint"))
+            .select_from(text("pg_class"))
+            .where(text("relname = :table").bindparams(table=table))
+            .scalar_subquery()
+        )
+    
+    def check_database_health(self, db) -> Dict[str, Any]:
         """Check database health and performance"""
-        if not self.db:
+        if db is None:
             return {"error": "Database not connected", "status": "error"}
         
         try:
-            # Basic connectivity
-            self.db.execute("SELECT 1")
-            
-            # Get table counts
-            clients_count = self.db.query(Client).count()
-            posts_count = self.db.query(MatchedPost).count()
-            responses_count = self.db.query(AIResponse).count()
-            configs_count = self.db.query(ClientConfig).count()
-            
-            # Get recent activity (last 24 hours)
+            # Table counts and recent activity (last 24 hours) as scalar subqueries of
+            # one statement, which also proves connectivity, so the check costs one round-trip.
+            # Posts and responses grow without bound, so their totals are planner estimates;
+            # the 24h windows are exact and served by the created_at indexes
             yesterday = datetime.utcnow() - timedelta(days=1)
-            recent_posts = self.db.query(MatchedPost).filter(
-                MatchedPost.created_at >= yesterday
-            ).count()
             
-            recent_responses = self.db.query(AIResponse).filter(
-                AIResponse.created_at >= yesterday
-            ).count()
+            def count(model, *criteria):
+                return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+            
+            (
+                clients_count,
+                posts_count,
+                responses_count,
+                configs_count,
+                recent_posts,
+                recent_responses,
+            ) = db.execute(select(
+                count(Client),
+                self._estimate_rows(MatchedPost.__tablename__),
+                self._estimate_rows(AIResponse.__tablename__),
+                count(ClientConfig),
+                count(MatchedPost, MatchedPost.created_at >= yesterday),
+                count(AIResponse, AIResponse.created_at >= yesterday),
+            )).one()
             
             return {
                 "connectivity": True,
@@ -223,78 +371,73 @@ class SystemMonitor:
         """Check Celery worker and beat health"""
         if not self.redis_client:
             return {"error": "Redis not available for Celery check", "status": "error"}
+        if not self._celery_app:
+            return {"error": "Celery app not available", "status": "error"}
         
         try:
-            # Check active workers
-            from celery import Celery
-            
-            if settings:
-                celery_app = Celery(
-                    "redditbot",
-                    broker=settings.celery_broker_url,
-                    backend=settings.celery_result_backend,
-                )
-            else:
-                celery_app = Celery(
-                    "redditbot",
-                    broker="redis://localhost:6379/1",
-                    backend="redis://localhost:6379/2",
-                )
-            
-            # Get active workers
-            inspect = celery_app.control.inspect()
-            active_workers = inspect.active()
-            stats = inspect.stats()
+            # A single short broadcast enumerates live workers
+            inspect = self._celery_app.control.inspect(timeout=0.5)
+            pong = inspect.ping() or {}
+            worker_count = len(pong)
             
-            worker_count = len(active_workers) if active_workers else 0
-            
-            # Check recent task execution
+            # Per-worker task totals need another broadcast, so only fetch them on request
             recent_tasks = 0
-            if stats:
+            if self.verbose and worker_count:
+                stats = inspect.stats() or {}
                 for worker_stats in stats.values():
                     recent_tasks += worker_stats.get('total', {}).get('tasks.reddit_tasks.scan_reddit', 0)
             
             return {
                 "active_workers": worker_count,
-                "worker_details": active_workers or {},
+                "worker_details": pong,
                 "recent_scan_tasks": recent_tasks,
                 "status": "healthy" if worker_count > 0 else "warning"
             }
         except Exception as e:
             return {"error": str(e), "status": "error"}
     
-    def get_performance_metrics(self) -> Dict[str, Any]:
+    PERFORMANCE_METRICS_SQL = """
+        SELECT 'event' AS kind, event_type AS label, count(*)::numeric AS value
+        FROM analytics_events
+        WHERE created_at >= :since
+        GROUP BY event_type
+        UNION ALL
+        SELECT 'quality', NULL, avg(score)
+        FROM ai_responses
+        WHERE created_at >= :since
+        UNION ALL
+        (
+            SELECT 'keyword', keywords_matched, count(*)
+            FROM matched_posts
+            WHERE created_at >= :since AND keywords_matched <> ''
+            GROUP BY keywords_matched
+            ORDER BY count(*) DESC
+            LIMIT 5
+        )
+    """
+    
+    def get_performance_metrics(self, db) -> Dict[str, Any]:
         """Get performance metrics from the last 24 hours"""
-        if not self.db:
+        if db is None:
             return {"error": "Database not available", "status": "error"}
         
         try:
             yesterday = datetime.utcnow() - timedelta(days=1)
             
-            # Get analytics events
-            events = self.db.query(
-                AnalyticsEvent.event_type,
-                func.count(AnalyticsEvent.id).label('count')
-            ).filter(
-                AnalyticsEvent.created_at >= yesterday
-            ).group_by(AnalyticsEvent.event_type).all()
-            
-            event_counts = {event_type: count for event_type, count in events}
-            
-            # Get average response quality
-            avg_quality = self.db.query(func.avg(AIResponse.score)).filter(
-                AIResponse.created_at >= yesterday
-            ).scalar() or 0
-            
-            # Get top performing keywords
-            top_keywords = self.db.query(
-                MatchedPost.keywords_matched,
-                func.count(MatchedPost.id).label('count')
-            ).filter(
-                MatchedPost.created_at >= yesterday
-            ).group_by(MatchedPost.keywords_matched).order_by(
-                func.count(MatchedPost.id).desc()
-            ).limit(5).all()
+            # Event counts, average response quality and top keywords in one round-trip;
+            # rows are told apart by the kind column
+            event_counts = {}
+            avg_quality = 0
+            top_keywords = []
+            for kind, label, value in db.execute(
+                text(self.PERFORMANCE_METRICS_SQL), {"since": yesterday}
+            ):
+                if kind == "event":
+                    event_counts[label] = int(value)
+                elif kind == "quality":
+                    avg_quality = value or 0
+                else:
+                    top_keywords.append((label, int(value)))
             
             return {
                 "events_24h": event_counts,
@@ -308,20 +451,79 @@ class SystemMonitor:
         except Exception as e:
             return {"error": str(e), "status": "error"}
     
-    def run_full_health_check(self) -> Dict[str, Any]:
-        """Run comprehensive health check"""
+    def invalidate_cache(self):
+        """Drop cached check results so the next report probes everything"""
+        self._cache.clear()
+    
+    def _cached(self, name: str, check, reuse: bool = False):
+        """Wrap a check so its last successful result is reused within the check's TTL,
+        or regardless of age when reuse is set"""
+        ttl = self.CHECK_TTLS.get(name, 0.0)
+        
+        def run():
+            now = time.monotonic()
+            hit = self._cache.get(name)
+            if hit and (reuse or now - hit[0] < ttl):
+                return hit[1]
+            result = check()
+            if result.get("status") != "error":
+                self._cache[name] = (now, result)
+            return result
+        return run
+    
+    def _with_session(self, check):
+        """Wrap a DB check so each run gets its own short-lived session.
+        
+        A fresh session per run sees current data rather than a long-lived
+        transaction's snapshot, and concurrent checks never share one.
+        """
+        def run():
+            if not settings:
+                return check(None)
+            with SessionLocal() as db:
+                return check(db)
+        return run
+    
+    async def run_full_health_check(self, tick: int = 0) -> Dict[str, Any]:
+        """Run comprehensive health check, probing every service concurrently.
+        
+        tick is the watch-mode refresh number; checks not due on this tick per
+        CHECK_CADENCE report their last result. The default runs everything.
+        """
         print("🔍 Running comprehensive system health check...")
         
-        health_report = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "system_resources": self.check_system_resources(),
-            "docker_services": self.check_docker_services(),
-            "api_health": self.check_api_health(),
-            "redis_health": self.check_redis_health(),
-            "database_health": self.check_database_health(),
-            "celery_health": self.check_celery_health(),
-            "performance_metrics": self.get_performance_metrics(),
+        checks = {
+            "system_resources": self.check_system_resources,
+            "docker_services": self.check_docker_services,
+            "api_health": self.check_api_health,
+            "redis_health": self.check_redis_health,
+            "database_health": self._with_session(self.check_database_health),
+            "celery_health": self.check_celery_health,
+            "performance_metrics": self._with_session(self.get_performance_metrics),
         }
+        checks = {
+            name: self._cached(name, check, reuse=tick % self.CHECK_CADENCE.get(name, 1) != 0)
+            for name, check in checks.items()
+        }
+        
+        # The checks block on subprocesses, HTTP, Redis and the DB, so run them in
+        # threads; a hung service only costs CHECK_TIMEOUT instead of stalling the report
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(loop.run_in_executor(self._executor, check), timeout=self.CHECK_TIMEOUT)
+                for check in checks.values()
+            ),
+            return_exceptions=True,
+        )
+        
+        health_report = {"timestamp": datetime.utcnow()}
+        for name, result in zip(checks, results):
+            if isinstance(result, asyncio.TimeoutError):
+                result = {"error": "timeout", "status": "error"}
+            elif isinstance(result, Exception):
+                result = {"error": str(result), "status": "error"}
+            health_report[name] = result
         
         # Calculate overall status
         statuses = [
@@ -341,8 +543,9 @@ class SystemMonitor:
         
         return health_report
     
-    def print_health_report(self, report: Dict[str, Any]):
-        """Print formatted health report"""
+    def print_health_report(self, report: Dict[str, Any], clear_screen: bool = False):
+        """Print formatted health report in a single write, optionally clearing the terminal first"""
+        lines: List[str] = ["\x1b[2J\x1b[H"] if clear_screen else []
         status_icons = {
             "healthy": "✅",
             "warning": "⚠️",
@@ -351,123 +554,126 @@ class SystemMonitor:
         }
         
         overall_status = report.get("overall_status", "unknown")
-        print(f"\n{status_icons[overall_status]} Overall System Status: {overall_status.upper()}")
-        print(f"📅 Report Time: {report['timestamp']}")
-        print("=" * 60)
+        lines.append(f"\n{status_icons[overall_status]} Overall System Status: {overall_status.upper()}")
+        lines.append(f"📅 Report Time: {report['timestamp'].isoformat()}")
+        lines.append("=" * 60)
         
         # System Resources
         resources = report.get("system_resources", {})
         status = resources.get("status", "unknown")
-        print(f"\n{status_icons[status]} System Resources:")
+        lines.append(f"\n{status_icons[status]} System Resources:")
         if "error" not in resources:
-            print(f"   CPU Usage: {resources.get('cpu_usage', 0):.1f}%")
-            print(f"   Memory Usage: {resources.get('memory_usage', 0):.1f}%")
-            print(f"   Memory Available: {resources.get('memory_available_gb', 0):.1f} GB")
-            print(f"   Disk Usage: {resources.get('disk_usage', 0):.1f}%")
-            print(f"   Disk Free: {resources.get('disk_free_gb', 0):.1f} GB")
+            lines.append(f"   CPU Usage: {resources.get('cpu_usage', 0):.1f}%")
+            lines.append(f"   Memory Usage: {resources.get('memory_usage', 0):.1f}%")
+            lines.append(f"   Memory Available: {resources.get('memory_available_gb', 0):.1f} GB")
+            lines.append(f"   Disk Usage: {resources.get('disk_usage', 0):.1f}%")
+            lines.append(f"   Disk Free: {resources.get('disk_free_gb', 0):.1f} GB")
         else:
-            print(f"   Error: {resources.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {resources.get('error', 'Unknown error')}")
         
         # Docker Services
         docker = report.get("docker_services", {})
         status = docker.get("status", "unknown")
-        print(f"\n{status_icons[status]} Docker Services:")
+        lines.append(f"\n{status_icons[status]} Docker Services:")
         if "error" not in docker:
             services = docker.get("services", [])
             for service in services:
                 service_icon = "✅" if service["healthy"] else "❌"
-                print(f"   {service_icon} {service['name']}: {service['state']}")
+                lines.append(f"   {service_icon} {service['name']}: {service['state']}")
         else:
-            print(f"   Error: {docker.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {docker.get('error', 'Unknown error')}")
         
         # API Health
         api = report.get("api_health", {})
         status = api.get("status", "unknown")
-        print(f"\n{status_icons[status]} API Health:")
+        lines.append(f"\n{status_icons[status]} API Health:")
         if "error" not in api:
-            print(f"   Health Endpoint: {'✅' if api.get('health_endpoint') else '❌'}")
-            print(f"   WebSocket Endpoint: {'✅' if api.get('websocket_endpoint') else '❌'}")
-            print(f"   Response Time: {api.get('response_time_ms', 0):.1f} ms")
+            lines.append(f"   Health Endpoint: {'✅' if api.get('health_endpoint') else '❌'}")
+            lines.append(f"   WebSocket Endpoint: {'✅' if api.get('websocket_endpoint') else '❌'}")
+            lines.append(f"   Response Time: {api.get('response_time_ms', 0):.1f} ms")
         else:
-            print(f"   Error: {api.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {api.get('error', 'Unknown error')}")
         
         # Redis Health
         redis_health = report.get("redis_health", {})
         status = redis_health.get("status", "unknown")
-        print(f"\n{status_icons[status]} Redis Health:")
+        lines.append(f"\n{status_icons[status]} Redis Health:")
         if "error" not in redis_health:
-            print(f"   Connection: {'✅' if redis_health.get('ping') else '❌'}")
-            print(f"   Memory Usage: {redis_health.get('memory_usage_mb', 0):.1f} MB")
-            print(f"   Connected Clients: {redis_health.get('connected_clients', 0)}")
-            print(f"   Uptime: {redis_health.get('uptime_seconds', 0)} seconds")
+            lines.append(f"   Connection: {'✅' if redis_health.get('ping') else '❌'}")
+            lines.append(f"   Memory Usage: {redis_health.get('memory_usage_mb', 0):.1f} MB")
+            lines.append(f"   Connected Clients: {redis_health.get('connected_clients', 0)}")
+            lines.append(f"   Uptime: {redis_health.get('uptime_seconds', 0)} seconds")
         else:
-            print(f"   Error: {redis_health.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {redis_health.get('error', 'Unknown error')}")
         
         # Database Health
         db_health = report.get("database_health", {})
         status = db_health.get("status", "unknown")
-        print(f"\n{status_icons[status]} Database Health:")
+        lines.append(f"\n{status_icons[status]} Database Health:")
         if "error" not in db_health:
-            print(f"   Clients: {db_health.get('clients', 0)}")
-            print(f"   Total Posts: {db_health.get('total_posts', 0)}")
-            print(f"   Total Responses: {db_health.get('total_responses', 0)}")
-            print(f"   Recent Posts (24h): {db_health.get('recent_posts_24h', 0)}")
-            print(f"   Recent Responses (24h): {db_health.get('recent_responses_24h', 0)}")
+            lines.append(f"   Clients: {db_health.get('clients', 0)}")
+            lines.append(f"   Total Posts: {db_health.get('total_posts', 0)}")
+            lines.append(f"   Total Responses: {db_health.get('total_responses', 0)}")
+            lines.append(f"   Recent Posts (24h): {db_health.get('recent_posts_24h', 0)}")
+            lines.append(f"   Recent Responses (24h): {db_health.get('recent_responses_24h', 0)}")
         else:
-            print(f"   Error: {db_health.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {db_health.get('error', 'Unknown error')}")
         
         # Celery Health
         celery_health = report.get("celery_health", {})
         status = celery_health.get("status", "unknown")
-        print(f"\n{status_icons[status]} Celery Health:")
+        lines.append(f"\n{status_icons[status]} Celery Health:")
         if "error" not in celery_health:
-            print(f"   Active Workers: {celery_health.get('active_workers', 0)}")
-            print(f"   Recent Scan Tasks: {celery_health.get('recent_scan_tasks', 0)}")
+            lines.append(f"   Active Workers: {celery_health.get('active_workers', 0)}")
+            lines.append(f"   Recent Scan Tasks: {celery_health.get('recent_scan_tasks', 0)}")
         else:
-            print(f"   Error: {celery_health.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {celery_health.get('error', 'Unknown error')}")
         
         # Performance Metrics
         perf = report.get("performance_metrics", {})
         status = perf.get("status", "unknown")
-        print(f"\n{status_icons[status]} Performance Metrics (24h):")
+        lines.append(f"\n{status_icons[status]} Performance Metrics (24h):")
         if "error" not in perf:
             events = perf.get("events_24h", {})
-            print(f"   Average Response Quality: {perf.get('avg_response_quality', 0)}")
-            print(f"   Events: {sum(events.values())} total")
+            lines.append(f"   Average Response Quality: {perf.get('avg_response_quality', 0)}")
+            lines.append(f"   Events: {sum(events.values())} total")
             for event_type, count in events.items():
-                print(f"     - {event_type}: {count}")
+                lines.append(f"     - {event_type}: {count}")
             
             top_keywords = perf.get("top_keywords", [])
             if top_keywords:
-                print("   Top Keywords:")
+                lines.append("   Top Keywords:")
                 for kw_data in top_keywords[:3]:
-                    print(f"     - {kw_data['keyword']}: {kw_data['matches']} matches")
+                    lines.append(f"     - {kw_data['keyword']}: {kw_data['matches']} matches")
         else:
-            print(f"   Error: {perf.get('error', 'Unknown error')}")
+            lines.append(f"   Error: {perf.get('error', 'Unknown error')}")
         
-        print("\n" + "=" * 60)
+        lines.append("\n" + "=" * 60)
         
         # Recommendations
         if overall_status != "healthy":
-            print("\n🔧 Recommendations:")
+            lines.append("\n🔧 Recommendations:")
             
             if resources.get("cpu_usage", 0) > 80:
-                print("   - High CPU usage detected. Consider scaling or optimizing tasks.")
+                lines.append("   - High CPU usage detected. Consider scaling or optimizing tasks.")
             
             if resources.get("memory_usage", 0) > 80:
-                print("   - High memory usage detected. Consider increasing RAM or optimizing queries.")
+                lines.append("   - High memory usage detected. Consider increasing RAM or optimizing queries.")
             
             if docker.get("healthy_services", 0) < docker.get("total_services", 1):
-                print("   - Some Docker services are not running. Check with: docker-compose ps")
+                lines.append("   - Some Docker services are not running. Check with: docker-compose ps")
             
             if not api.get("health_endpoint"):
-                print("   - API health endpoint not responding. Check backend service.")
+                lines.append("   - API health endpoint not responding. Check backend service.")
             
             if celery_health.get("active_workers", 0) == 0:
-                print("   - No Celery workers active. Background tasks won't process.")
+                lines.append("   - No Celery workers active. Background tasks won't process.")
             
-            print("   - Check logs with: docker-compose logs [service_name]")
-            print("   - Restart services with: docker-compose restart")
+            lines.append("   - Check logs with: docker-compose logs [service_name]")
+            lines.append("   - Restart services with: docker-compose restart")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 def main():
@@ -475,22 +681,26 @@ def main():
     parser.add_argument("--json", action="store_true", help="Output in JSON format")
     parser.add_argument("--watch", type=int, help="Watch mode - refresh every N seconds")
     parser.add_argument("--save", type=str, help="Save report to file")
+    parser.add_argument("--disk-path", type=str, default="/", help="Filesystem path to report disk usage for")
+    parser.add_argument("--verbose", action="store_true", help="Include per-worker Celery task stats")
     
     args = parser.parse_args()
     
-    monitor = SystemMonitor()
+    monitor = SystemMonitor(disk_path=args.disk_path, verbose=args.verbose)
     
-    def run_check():
-        report = monitor.run_full_health_check()
+    def run_check(clear_screen=False, tick=0):
+        report = asyncio.run(monitor.run_full_health_check(tick))
         
         if args.json:
-            print(json.dumps(report, indent=2))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC) + b"\n")
+            sys.stdout.buffer.flush()
         else:
-            monitor.print_health_report(report)
+            monitor.print_health_report(report, clear_screen=clear_screen)
         
         if args.save:
-            with open(args.save, 'w') as f:
-                json.dump(report, f, indent=2)
+            with open(args.save, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC))
             print(f"\n📄 Report saved to: {args.save}")
         
         return report
@@ -499,12 +709,16 @@ def main():
         print(f"👀 Watching system health (refreshing every {args.watch} seconds)")
         print("Press Ctrl+C to stop")
         
+        # SIGHUP forces a full re-probe on the next refresh
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, lambda signum, frame: monitor.invalidate_cache())
+        
+        tick = 0
         try:
             while True:
-                if not args.json:
-                    os.system('clear' if os.name == 'posix' else 'cls')
-                
-                report = run_check()
+                # The text report clears the screen in the same write as its output
+                report = run_check(clear_screen=True, tick=tick)
+                tick += 1
                 
                 if not args.json:
                     print(f"\n⏰ Next refresh in {args.watch} seconds...")
@@ -512,8 +726,13 @@ def main():
                 time.sleep(args.watch)
         except KeyboardInterrupt:
             print("\n👋 Monitoring stopped")
+        finally:
+            monitor.close()
     else:
-        run_check()
+        try:
+            run_check()
+        finally:
+            monitor.close()
 
 
 if __name__ == "__main__":
@@ -2,18 +2,19 @@
 """
 Test all API endpoints
 """
-import requests
+import asyncio
+import httpx
 import json
 
 BASE_URL = "http://localhost:8001"
 API_PREFIX = "/api"
 
 # First, login to get a token
-def get_auth_token():
+async def get_auth_token(client):
     print("🔐 Testing Authentication...")
     try:
-        response = requests.post(
-            f"{BASE_URL}{API_PREFIX}/auth/login",
+        response = await client.post(
+            f"{API_PREFIX}/auth/login",
             data={
                 "username": "admin@example.com",
                 "password": "admin123"
@@ -30,91 +31,95 @@ def get_auth_token():
         print(f"✗ Login error: {e}")
         return None
 
-def test_endpoint(method, endpoint, token=None, data=None, description=""):
-    """Test a single endpoint"""
-    url = f"{BASE_URL}{API_PREFIX}{endpoint}"
+async def test_endpoint(client, method, endpoint, token=None, data=None, description="", log=print):
+    """Test a single endpoint, reporting through log (print by default)"""
+    url = f"{API_PREFIX}{endpoint}"
     headers = {}
     if token:
         headers["Authorization"] = f"Bearer {token}"
     
     try:
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            response = requests.post(url, headers=headers, json=data)
-        elif method == "PUT":
-            response = requests.put(url, headers=headers, json=data)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
+        if method in ("POST", "PUT"):
+            response = await client.request(method, url, headers=headers, json=data)
+        else:
+            response = await client.request(method, url, headers=headers)
         
         status = "✓" if response.status_code < 400 else "✗"
-        print(f"{status} {method} {endpoint} - {response.status_code} - {description}")
+        log(f"{status} {method} {endpoint} - {response.status_code} - {description}")
         
         if response.status_code < 400:
             try:
                 data = response.json()
                 if isinstance(data, list):
-                    print(f"   → Returned {len(data)} items")
+                    log(f"   → Returned {len(data)} items")
                 elif isinstance(data, dict):
-                    print(f"   → Keys: {list(data.keys())[:5]}")
+                    log(f"   → Keys: {list(data.keys())[:5]}")
             except:
                 pass
         else:
-            print(f"   → Error: {response.text[:100]}")
+            log(f"   → Error: {response.text[:100]}")
         
         return response
     except Exception as e:
-        print(f"✗ {method} {endpoint} - ERROR: {e}")
+        log(f"✗ {method} {endpoint} - ERROR: {e}")
         return None
 
-def main():
+async def run_tests():
     print("=" * 60)
     print("API ENDPOINT TESTING")
     print("=" * 60)
     
-    # Get auth token
-    token = get_auth_token()
-    if not token:
-        print("\n❌ Cannot proceed without authentication token")
-        return
-    
-    print("\n" + "=" * 60)
-    print("TESTING ENDPOINTS")
-    print("=" * 60)
-    
-    # Health check
-    print("\n📊 Health & Status:")
-    test_endpoint("GET", "/health", description="Health check")
-    
-    # Auth endpoints
-    print("\n🔐 Authentication:")
-    test_endpoint("GET", "/auth/me", token, description="Get current user")
-    
-    # Clients
-    print("\n👥 Clients:")
-    test_endpoint("GET", "/clients", token, description="List clients")
-    
-    # Configs
-    print("\n⚙️  Configurations:")
-    configs_response = test_endpoint("GET", "/configs", token, description="List configs")
-    
-    # Posts
-    print("\n📝 Posts:")
-    posts_response = test_endpoint("GET", "/posts", token, description="List posts")
-    
-    # Analytics
-    print("\n📈 Analytics:")
-    test_endpoint("GET", "/analytics/summary", token, description="Dashboard summary")
-    test_endpoint("GET", "/analytics/trends", token, description="Trends")
-    test_endpoint("GET", "/analytics/keyword-insights", token, description="Keyword insights")
-    
-    # Users
-    print("\n👤 Users:")
-    test_endpoint("GET", "/users", token, description="List users")
-    
-    # Operations
-    print("\n🔄 Operations:")
-    scan_response = test_endpoint("POST", "/ops/scan", token, description="Trigger scan")
+    # One connection pool shared by login, the concurrent probes and the scan
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        timeout=None,
+        follow_redirects=True,
+    ) as client:
+        # Get auth token
+        token = await get_auth_token(client)
+        if not token:
+            print("\n❌ Cannot proceed without authentication token")
+            return
+        
+        print("\n" + "=" * 60)
+        print("TESTING ENDPOINTS")
+        print("=" * 60)
+        
+        # Read-only endpoints are independent, so probe them concurrently
+        # (section, method, endpoint, token, description)
+        probes = [
+            ("📊 Health & Status:", "GET", "/health", None, "Health check"),
+            ("🔐 Authentication:", "GET", "/auth/me", token, "Get current user"),
+            ("👥 Clients:", "GET", "/clients", token, "List clients"),
+            ("⚙️  Configurations:", "GET", "/configs", token, "List configs"),
+            ("📝 Posts:", "GET", "/posts", token, "List posts"),
+            ("📈 Analytics:", "GET", "/analytics/summary", token, "Dashboard summary"),
+            ("📈 Analytics:", "GET", "/analytics/trends", token, "Trends"),
+            ("📈 Analytics:", "GET", "/analytics/keyword-insights", token, "Keyword insights"),
+            ("👤 Users:", "GET", "/users", token, "List users"),
+        ]
+        
+        async def run_probe(probe):
+            _, method, endpoint, probe_token, description = probe
+            lines = []
+            await test_endpoint(client, method, endpoint, probe_token, description=description, log=lines.append)
+            return lines
+        
+        outputs = await asyncio.gather(*(run_probe(probe) for probe in probes))
+        
+        # Print each probe's buffered output in declaration order
+        current_section = None
+        for probe, lines in zip(probes, outputs):
+            if probe[0] != current_section:
+                current_section = probe[0]
+                print(f"\n{current_section}")
+            for line in lines:
+                print(line)
+        
+        # Operations
+        print("\n🔄 Operations:")
+        scan_response = await test_endpoint(client, "POST", "/ops/scan", token, description="Trigger scan")
     
     if scan_response and scan_response.status_code == 200:
         result = scan_response.json()
@@ -131,5 +136,8 @@ def main():
     print("TESTING COMPLETE")
     print("=" * 60)
 
+def main():
+    asyncio.run(run_tests())
+
 if __name__ == "__main__":
     main()
@@ -19,12 +19,12 @@ import logging
 import sys
 import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
-import requests
+import httpx
 import websockets
-from urllib.parse import urlencode
-import jwt
-import base64
+import binascii
+import orjson
 
 # Configure logging
 logging.basicConfig(
@@ -41,14 +41,99 @@ TEST_USER_PASSWORD = "client123"
 TEST_ADMIN_EMAIL = "admin@example.com"
 TEST_ADMIN_PASSWORD = "admin123"
 
+# The probes exchange one small JSON frame, so skip permessage-deflate negotiation,
+# cap frame size and bound the handshake
+WS_CONNECT_OPTIONS = {"compression": None, "max_size": 1 << 20, "open_timeout": 5}
+
+# Upper bound on probes in flight at once; below the client pool size and server FD limits
+MAX_CONCURRENT_PROBES = 20
+
+# Endpoint paths, resolved against the client's base_url
+_URL_REGISTER = "/api/auth/register"
+_URL_LOGIN = "/api/auth/login"
+_URL_ME = "/api/users/me"
+_URL_CONFIGS = "/api/configs"
+_URL_DEBUG_TOKEN = "/api/auth/debug/token-info"
+_WS_URL = f"{WS_BASE_URL}/api/ws"
+
+_PASS = "✅ PASS"
+_FAIL = "❌ FAIL"
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Malformed token shared by the negative API and WebSocket tests
+INVALID_TOKEN = "invalid.token.here"
+_INVALID_BEARER = {"Authorization": f"Bearer {INVALID_TOKEN}"}
+
+# Maps the URL-safe base64 alphabet onto the standard one binascii decodes
+_B64_TRANS = bytes.maketrans(b'-_', b'+/')
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment with the C-level binascii decoder"""
+    raw = segment.encode().translate(_B64_TRANS)
+    return binascii.a2b_base64(raw + b'=' * (-len(raw) % 4))
+
+@lru_cache(maxsize=512)
+def _decode_jwt_structure(token: str) -> Tuple[bool, Dict[str, Any]]:
+    """Decode a JWT's header and payload without verification and check required claims.
+    
+    Memoized per token: the same token is validated repeatedly during a run.
+    """
+    try:
+        # Decode without verification to check structure; the signature is never decoded
+        try:
+            header_b64, payload_b64, signature = token.split('.', 2)
+        except ValueError:
+            return False, {"error": "Invalid JWT structure"}
+        if '.' in signature:
+            return False, {"error": "Invalid JWT structure"}
+        
+        # Decode header and payload
+        header = orjson.loads(_b64url_decode(header_b64))
+        payload = orjson.loads(_b64url_decode(payload_b64))
+        
+        # Check required fields
+        required_fields = ['sub', 'user_id', 'exp', 'iat']
+        missing_fields = [field for field in required_fields if field not in payload]
+        
+        if missing_fields:
+            return False, {"error": f"Missing required fields: {missing_fields}"}
+        
+        return True, {"header": header, "payload": payload}
+        
+    except Exception as e:
+        return False, {"error": f"Token validation error: {str(e)}"}
+
 class AuthenticationTester:
     """Comprehensive authentication flow tester"""
     
     def __init__(self):
-        self.session = requests.Session()
+        # One pooled keep-alive client shared by every HTTP test
+        self.client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0,
+        )
         self.user_token = None
         self.admin_token = None
+        # Authorization headers, built once when each login succeeds
+        self._user_headers = None
+        self._admin_headers = None
         self.test_results = []
+        # Running tallies kept by log_test_result, so the summary needs no extra pass
+        self._passed = 0
+        self._failed = 0
+        self._probe_slots = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    
+    async def _guarded(self, coro):
+        """Await a probe coroutine once a concurrency slot is free"""
+        async with self._probe_slots:
+            return await coro
+    
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.client.aclose()
         
     def log_test_result(self, test_name: str, success: bool, details: str = "", error: str = ""):
         """Log test result"""
@@ -57,56 +142,45 @@ class AuthenticationTester:
             "success": success,
             "details": details,
             "error": error,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            # Formatted once when the report is written
+            "timestamp_ns": time.time_ns()
         }
         self.test_results.append(result)
+        self._passed += success
+        self._failed += not success
         
-        status = "✅ PASS" if success else "❌ FAIL"
-        logger.info(f"{status} - {test_name}")
-        if details:
-            logger.info(f"  Details: {details}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s - %s", _PASS if success else _FAIL, test_name)
+            if details:
+                logger.info("  Details: %s", details)
         if error:
-            logger.error(f"  Error: {error}")
+            logger.error("  Error: %s", error)
     
-    def validate_jwt_token(self, token: str) -> Tuple[bool, Dict[str, Any]]:
-        """Validate JWT token structure and content"""
-        try:
-            # Decode without verification to check structure
-            parts = token.split('.')
-            if len(parts) != 3:
-                return False, {"error": "Invalid JWT structure"}
-            
-            # Decode header and payload
-            header = json.loads(base64.urlsafe_b64decode(parts[0] + '=='))
-            payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=='))
-            
-            # Check required fields
-            required_fields = ['sub', 'user_id', 'exp', 'iat']
-            missing_fields = [field for field in required_fields if field not in payload]
-            
-            if missing_fields:
-                return False, {"error": f"Missing required fields: {missing_fields}"}
-            
-            # Check expiration
-            exp = payload.get('exp')
+    def validate_jwt_token(self, token: str, now: Optional[float] = None) -> Tuple[bool, Dict[str, Any]]:
+        """Validate JWT token structure and content.
+        
+        Pass now to validate a batch of tokens against a single clock reading.
+        """
+        is_valid, decoded = _decode_jwt_structure(token)
+        if not is_valid:
+            return False, dict(decoded)
+        
+        # Expiration is checked on every call, since a cached decode can outlive the token
+        if now is None:
             now = time.time()
-            if exp <= now:
-                return False, {"error": "Token expired"}
-            
-            return True, {
-                "header": header,
-                "payload": payload,
-                "valid_until": datetime.fromtimestamp(exp, tz=timezone.utc).isoformat()
-            }
-            
-        except Exception as e:
-            return False, {"error": f"Token validation error: {str(e)}"}
+        if decoded["payload"].get('exp') <= now:
+            return False, {"error": "Token expired"}
+        
+        return True, {
+            "header": decoded["header"],
+            "payload": decoded["payload"],
+        }
     
-    def test_user_registration(self) -> bool:
+    async def test_user_registration(self) -> bool:
         """Test user registration"""
         try:
             # First, try to create a test user with a client
-            response = self.session.post(f"{API_BASE_URL}/api/auth/register", json={
+            response = await self.client.post(_URL_REGISTER, json={
                 "email": TEST_USER_EMAIL,
                 "password": TEST_USER_PASSWORD,
                 "role": "client",
@@ -140,7 +214,7 @@ class AuthenticationTester:
             self.log_test_result("User Registration", False, error=str(e))
             return False
     
-    def test_user_login(self) -> bool:
+    async def test_user_login(self) -> bool:
         """Test user login and token creation"""
         try:
             # Test login with form data
@@ -149,10 +223,10 @@ class AuthenticationTester:
                 "password": TEST_USER_PASSWORD
             }
             
-            response = self.session.post(
-                f"{API_BASE_URL}/api/auth/login",
+            response = await self.client.post(
+                _URL_LOGIN,
                 data=login_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+                headers=_FORM_HEADERS
             )
             
             if response.status_code == 200:
@@ -178,10 +252,12 @@ class AuthenticationTester:
                     return False
                 
                 self.user_token = token
+                self._user_headers = {"Authorization": "Bearer " + token}
                 self.log_test_result(
                     "User Login", 
                     True, 
-                    f"Login successful, token expires: {token_info['valid_until']}"
+                    f"Login successful, token expires: "
+                    f"{datetime.fromtimestamp(token_info['payload']['exp'], tz=timezone.utc).isoformat()}"
                 )
                 return True
             else:
@@ -196,7 +272,7 @@ class AuthenticationTester:
             self.log_test_result("User Login", False, error=str(e))
             return False
     
-    def test_admin_login(self) -> bool:
+    async def test_admin_login(self) -> bool:
         """Test admin login for debug endpoints"""
         try:
             # Try to login as admin (may not exist, that's ok)
@@ -205,15 +281,17 @@ class AuthenticationTester:
                 "password": TEST_ADMIN_PASSWORD
             }
             
-            response = self.session.post(
-                f"{API_BASE_URL}/api/auth/login",
+            response = await self.client.post(
+                _URL_LOGIN,
                 data=login_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
+                headers=_FORM_HEADERS
             )
             
             if response.status_code == 200:
                 data = response.json()
                 self.admin_token = data.get("access_token")
+                if self.admin_token:
+                    self._admin_headers = {"Authorization": "Bearer " + self.admin_token}
                 self.log_test_result("Admin Login", True, "Admin login successful")
                 return True
             else:
@@ -228,7 +306,7 @@ class AuthenticationTester:
             self.log_test_result("Admin Login", False, error=str(e))
             return False
     
-    def test_api_authentication(self) -> bool:
+    async def test_api_authentication(self) -> bool:
         """Test API endpoint authentication with valid token"""
         if not self.user_token:
             self.log_test_result(
@@ -240,10 +318,7 @@ class AuthenticationTester:
         
         try:
             # Test authenticated API endpoint (use /users/me which requires auth)
-            headers = {"Authorization": f"Bearer {self.user_token}"}
-            
-            # Try to access a protected endpoint
-            response = self.session.get(f"{API_BASE_URL}/api/users/me", headers=headers)
+            response = await self.client.get(_URL_ME, headers=self._user_headers)
             
             if response.status_code == 200:
                 self.log_test_result(
@@ -264,11 +339,11 @@ class AuthenticationTester:
             self.log_test_result("API Authentication", False, error=str(e))
             return False
     
-    def test_api_without_token(self) -> bool:
+    async def test_api_without_token(self) -> bool:
         """Test API endpoint without token (should fail with 401)"""
         try:
             # Try to access protected endpoint without token
-            response = self.session.get(f"{API_BASE_URL}/api/users/me")
+            response = await self.client.get(_URL_ME)
             
             if response.status_code == 401:
                 self.log_test_result(
@@ -289,12 +364,11 @@ class AuthenticationTester:
             self.log_test_result("API Without Token", False, error=str(e))
             return False
     
-    def test_api_with_invalid_token(self) -> bool:
+    async def test_api_with_invalid_token(self) -> bool:
         """Test API endpoint with invalid token (should fail with 401)"""
         try:
             # Try to access protected endpoint with invalid token
-            headers = {"Authorization": "Bearer invalid.token.here"}
-            response = self.session.get(f"{API_BASE_URL}/api/users/me", headers=headers)
+            response = await self.client.get(_URL_ME, headers=_INVALID_BEARER)
             
             if response.status_code == 401:
                 self.log_test_result(
@@ -327,20 +401,21 @@ class AuthenticationTester:
         
         try:
             # Create WebSocket connection with token
-            ws_url = f"{WS_BASE_URL}/api/ws?token={self.user_token}"
+            ws_url = f"{_WS_URL}?token={self.user_token}"
             
-            async with websockets.connect(ws_url) as websocket:
+            async with websockets.connect(ws_url, **WS_CONNECT_OPTIONS) as websocket:
                 # Send a ping message
                 ping_message = {
                     "type": "ping",
                     "timestamp": time.time()
                 }
-                await websocket.send(json.dumps(ping_message))
+                # The server reads text frames, so send the encoded JSON as str
+                await websocket.send(orjson.dumps(ping_message).decode())
                 
                 # Wait for response (with timeout)
                 try:
                     response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    response_data = json.loads(response)
+                    response_data = orjson.loads(response)
                     
                     self.log_test_result(
                         "WebSocket Authentication", 
@@ -392,160 +467,75 @@ class AuthenticationTester:
             self.log_test_result("WebSocket Authentication", False, error=str(e))
             return False
     
-    async def test_websocket_without_token(self) -> bool:
-        """Test WebSocket connection without token (should fail)"""
+    async def _expect_websocket_rejected(self, test_name: str, ws_url: str, condition: str) -> bool:
+        """Connect to ws_url and pass only if the server refuses the connection"""
         try:
-            # Try to connect without token
-            ws_url = f"{WS_BASE_URL}/api/ws"
-            
-            async with websockets.connect(ws_url) as websocket:
+            async with websockets.connect(ws_url, **WS_CONNECT_OPTIONS) as websocket:
                 # If we get here, the connection succeeded when it shouldn't have
                 self.log_test_result(
-                    "WebSocket Without Token", 
+                    test_name, 
                     False, 
-                    error="WebSocket connection succeeded without token"
+                    error=f"WebSocket connection succeeded {condition}"
                 )
                 return False
                 
-        except websockets.exceptions.ConnectionClosedError as e:
-            # This is expected - should fail with auth error
-            if e.code >= 4001 and e.code <= 4007:
-                self.log_test_result(
-                    "WebSocket Without Token", 
-                    True, 
-                    f"Correctly rejected WebSocket without token: {e.code} - {e.reason}"
-                )
-                return True
-            else:
+        except (websockets.exceptions.ConnectionClosed, websockets.exceptions.InvalidHandshake) as e:
+            if isinstance(e, websockets.exceptions.ConnectionClosed):
+                # Closed after accept - should carry one of the auth close codes
+                if 4001 <= e.code <= 4007:
+                    self.log_test_result(
+                        test_name, 
+                        True, 
+                        f"Correctly rejected WebSocket {condition}: {e.code} - {e.reason}"
+                    )
+                    return True
                 self.log_test_result(
-                    "WebSocket Without Token", 
+                    test_name, 
                     False, 
                     error=f"Unexpected error code: {e.code} - {e.reason}"
                 )
                 return False
-        except websockets.exceptions.InvalidStatusCode as e:
-            # Handle HTTP status code errors (like 403)
-            if e.status_code == 403:
-                self.log_test_result(
-                    "WebSocket Without Token", 
-                    True, 
-                    "Correctly rejected WebSocket without token (403)"
-                )
-                return True
-            else:
-                self.log_test_result(
-                    "WebSocket Without Token", 
-                    False, 
-                    error=f"Unexpected HTTP status: {e.status_code}"
-                )
-                return False
-        except Exception as e:
-            # Handle other connection errors
-            if "403" in str(e) or "Forbidden" in str(e):
-                self.log_test_result(
-                    "WebSocket Without Token", 
-                    True, 
-                    "Correctly rejected WebSocket without token"
-                )
-                return True
-            else:
-                self.log_test_result("WebSocket Without Token", False, error=str(e))
-                return False
-                
-        except Exception as e:
-            # Check if it's a missing token parameter error
-            if "token" in str(e).lower():
-                self.log_test_result(
-                    "WebSocket Without Token", 
-                    True, 
-                    "Correctly rejected WebSocket without token parameter"
-                )
-                return True
-            else:
-                self.log_test_result("WebSocket Without Token", False, error=str(e))
-                return False
-    
-    async def test_websocket_invalid_token(self) -> bool:
-        """Test WebSocket connection with invalid token (should fail)"""
-        try:
-            # Try to connect with invalid token
-            ws_url = f"{WS_BASE_URL}/api/ws?token=invalid.token.here"
             
-            async with websockets.connect(ws_url) as websocket:
-                # If we get here, the connection succeeded when it shouldn't have
-                self.log_test_result(
-                    "WebSocket Invalid Token", 
-                    False, 
-                    error="WebSocket connection succeeded with invalid token"
-                )
-                return False
-                
-        except websockets.exceptions.ConnectionClosedError as e:
-            # This is expected - should fail with auth error
-            if e.code >= 4001 and e.code <= 4007:
-                self.log_test_result(
-                    "WebSocket Invalid Token", 
-                    True, 
-                    f"Correctly rejected WebSocket with invalid token: {e.code} - {e.reason}"
-                )
-                return True
-            else:
-                self.log_test_result(
-                    "WebSocket Invalid Token", 
-                    False, 
-                    error=f"Unexpected error code: {e.code} - {e.reason}"
-                )
-                return False
-        except websockets.exceptions.InvalidStatusCode as e:
-            # Handle HTTP status code errors (like 403)
-            if e.status_code == 403:
-                self.log_test_result(
-                    "WebSocket Invalid Token", 
-                    True, 
-                    "Correctly rejected WebSocket with invalid token (403)"
-                )
-                return True
-            else:
+            # Rejected during the HTTP handshake (like 403)
+            status_code = getattr(e, "status_code", None)
+            if status_code == 403:
                 self.log_test_result(
-                    "WebSocket Invalid Token", 
-                    False, 
-                    error=f"Unexpected HTTP status: {e.status_code}"
-                )
-                return False
-        except Exception as e:
-            # Handle other connection errors
-            if "403" in str(e) or "Forbidden" in str(e):
-                self.log_test_result(
-                    "WebSocket Invalid Token", 
+                    test_name, 
                     True, 
-                    "Correctly rejected WebSocket with invalid token"
+                    f"Correctly rejected WebSocket {condition} (403)"
                 )
                 return True
-            else:
-                self.log_test_result("WebSocket Invalid Token", False, error=str(e))
-                return False
-                
-        except Exception as e:
-            self.log_test_result("WebSocket Invalid Token", False, error=str(e))
-            return False
-    
-    def test_debug_endpoints(self) -> bool:
-        """Test authentication debug endpoints (if admin token available)"""
-        if not self.admin_token:
             self.log_test_result(
-                "Debug Endpoints", 
+                test_name, 
                 False, 
-                "Admin token not available, skipping debug endpoint tests"
+                error=f"Unexpected HTTP status: {status_code}" if status_code else f"Handshake error: {e}"
             )
             return False
-        
+        except Exception as e:
+            # Connection-level failures (server down, timeouts) are not a rejection
+            self.log_test_result(test_name, False, error=str(e))
+            return False
+    
+    async def test_websocket_without_token(self) -> bool:
+        """Test WebSocket connection without token (should fail)"""
+        return await self._expect_websocket_rejected(
+            "WebSocket Without Token", _WS_URL, "without token"
+        )
+    
+    async def test_websocket_invalid_token(self) -> bool:
+        """Test WebSocket connection with invalid token (should fail)"""
+        return await self._expect_websocket_rejected(
+            "WebSocket Invalid Token", f"{_WS_URL}?token={INVALID_TOKEN}", "with invalid token"
+        )
+    
+    async def test_debug_endpoints(self) -> bool:
+        """Test authentication debug endpoints (only called when an admin token is available)"""
         try:
-            headers = {"Authorization": f"Bearer {self.admin_token}"}
-            
             # Test token info endpoint
-            response = self.session.get(
-                f"{API_BASE_URL}/api/auth/debug/token-info?token={self.user_token}",
-                headers=headers
+            response = await self.client.get(
+                _URL_DEBUG_TOKEN,
+                params={"token": self.user_token},
+                headers=self._admin_headers
             )
             
             if response.status_code == 200:
@@ -568,12 +558,11 @@ class AuthenticationTester:
             self.log_test_result("Debug Endpoints", False, error=str(e))
             return False
     
-    def test_error_handling(self) -> bool:
+    async def test_error_handling(self) -> bool:
         """Test error handling and response format"""
         try:
             # Test with expired/invalid token to check error format
-            headers = {"Authorization": "Bearer expired.token.here"}
-            response = self.session.get(f"{API_BASE_URL}/api/users/me", headers=headers)
+            response = await self.client.get(_URL_ME, headers=_INVALID_BEARER)
             
             if response.status_code == 401:
                 try:
@@ -612,7 +601,7 @@ class AuthenticationTester:
             self.log_test_result("Error Handling", False, error=str(e))
             return False
     
-    def test_client_data_isolation(self) -> bool:
+    async def test_client_data_isolation(self) -> bool:
         """Test client data isolation with authentication"""
         if not self.user_token:
             self.log_test_result(
@@ -623,11 +612,9 @@ class AuthenticationTester:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.user_token}"}
-            
             # Try to access client-specific endpoints
             # This tests that the client_id from the token is properly used
-            response = self.session.get(f"{API_BASE_URL}/api/configs", headers=headers)
+            response = await self.client.get(_URL_CONFIGS, headers=self._user_headers)
             
             # Should either succeed (if user has client) or fail with proper error
             if response.status_code in [200, 404, 403]:
@@ -656,46 +643,48 @@ class AuthenticationTester:
         logger.info(f"WebSocket Base URL: {WS_BASE_URL}")
         logger.info("=" * 60)
         
-        # Test 1: User Registration
-        self.test_user_registration()
-        
-        # Test 2: User Login (JWT Token Creation)
-        self.test_user_login()
-        
-        # Test 3: Admin Login (for debug endpoints)
-        self.test_admin_login()
-        
-        # Test 4: API Authentication with valid token
-        self.test_api_authentication()
-        
-        # Test 5: API without token (should fail)
-        self.test_api_without_token()
+        # Test 1: User Registration, alongside Test 3: Admin Login (for debug endpoints);
+        # the admin account is independent of the test user
+        await asyncio.gather(
+            self._guarded(self.test_user_registration()),
+            self._guarded(self.test_admin_login()),
+            return_exceptions=True,
+        )
         
-        # Test 6: API with invalid token (should fail)
-        self.test_api_with_invalid_token()
+        # Test 2: User Login (JWT Token Creation) - needs the registered user
+        await self.test_user_login()
         
-        # Test 7: WebSocket authentication with valid token
-        await self.test_websocket_authentication()
-        
-        # Test 8: WebSocket without token (should fail)
-        await self.test_websocket_without_token()
-        
-        # Test 9: WebSocket with invalid token (should fail)
-        await self.test_websocket_invalid_token()
-        
-        # Test 10: Debug endpoints (if admin available)
-        self.test_debug_endpoints()
-        
-        # Test 11: Error handling and response format
-        self.test_error_handling()
-        
-        # Test 12: Client data isolation
-        self.test_client_data_isolation()
+        # Tests 4-12 only need the tokens obtained above and are independent of each
+        # other, so their requests and WebSocket handshakes go out concurrently:
+        #   4: API authentication with valid token
+        #   5: API without token (should fail)
+        #   6: API with invalid token (should fail)
+        #   7: WebSocket authentication with valid token
+        #   8: WebSocket without token (should fail)
+        #   9: WebSocket with invalid token (should fail)
+        #   10: Debug endpoints (only if admin login succeeded)
+        #   11: Error handling and response format
+        #   12: Client data isolation
+        tests = [
+            self.test_api_authentication(),
+            self.test_api_without_token(),
+            self.test_api_with_invalid_token(),
+            self.test_websocket_authentication(),
+            self.test_websocket_without_token(),
+            self.test_websocket_invalid_token(),
+            self.test_error_handling(),
+            self.test_client_data_isolation(),
+        ]
+        if self.admin_token:
+            tests.append(self.test_debug_endpoints())
+        else:
+            logger.info("Admin token not available, skipping debug endpoint tests")
+        await asyncio.gather(*(self._guarded(test) for test in tests), return_exceptions=True)
         
         # Calculate results
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result["success"])
-        failed_tests = total_tests - passed_tests
+        passed_tests = self._passed
+        failed_tests = self._failed
         
         logger.info("=" * 60)
         logger.info("📊 TEST RESULTS SUMMARY")
@@ -728,8 +717,14 @@ async def main():
         results = await tester.run_all_tests()
         
         # Save detailed results to file
-        with open("authentication_test_results.json", "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        # (orjson serializes the datetimes natively)
+        for result in results["test_results"]:
+            result["timestamp"] = datetime.fromtimestamp(
+                result.pop("timestamp_ns") / 1e9, tz=timezone.utc
+            )
+        
+        with open("authentication_test_results.json", "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         
         logger.info(f"\n📄 Detailed results saved to: authentication_test_results.json")
         
@@ -742,7 +737,19 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Test execution failed: {str(e)}")
         sys.exit(1)
+    finally:
+        await tester.aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # The probes are socket-bound, so run them on uvloop when it is available
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        if sys.version_info >= (3, 12):
+            asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+        else:
+            uvloop.install()
+            asyncio.run(main())
\ No newline at end of file
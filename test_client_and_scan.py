@@ -2,188 +2,214 @@
 """
 Test script to verify client creation and scan functionality
 """
-import requests
-import json
+import argparse
+import asyncio
+import httpx
+import logging
+import orjson
 import time
 
+logger = logging.getLogger(__name__)
+
 API_BASE_URL = "http://localhost:8000/api"
 
-def test_login():
+# Only this many posts are shown, so only this many are requested
+POSTS_PREVIEW_LIMIT = 5
+
+# Everything but the client id is the same for every config the script creates
+CONFIG_TEMPLATE = {
+    "reddit_subreddits": ["technology", "programming"],
+    "keywords": ["API", "integration"],
+    "is_active": True,
+    "scan_interval_minutes": 360,
+    "scan_start_hour": 0,
+    "scan_end_hour": 23,
+    "scan_days": "1,2,3,4,5,6,7"
+}
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+async def test_login(client):
     """Login as admin"""
-    print("\n🔐 Testing login...")
-    response = requests.post(f"{API_BASE_URL}/auth/login", data={
+    logger.info("\n🔐 Testing login...")
+    response = await client.post("/auth/login", data={
         "username": "admin@example.com",
         "password": "admin123"
     })
     
     if response.status_code == 200:
         token = response.json()["access_token"]
-        print(f"✅ Login successful")
+        logger.info("✅ Login successful")
         return token
     else:
-        print(f"❌ Login failed: {response.status_code} - {response.text}")
+        logger.error("❌ Login failed: %s - %s", response.status_code, response.text)
         return None
 
-def test_list_clients(token):
+async def test_list_clients(client, log=logger.log):
     """List existing clients"""
-    print("\n📋 Listing clients...")
-    response = requests.get(
-        f"{API_BASE_URL}/clients",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    log(logging.INFO, "\n📋 Listing clients...")
+    response = await client.get("/clients")
     
     if response.status_code == 200:
-        clients = response.json()
-        print(f"✅ Found {len(clients)} clients")
-        for client in clients:
-            print(f"   - {client['name']} (ID: {client['id']})")
+        clients = orjson.loads(response.content)
+        log(logging.INFO, "✅ Found %s clients", len(clients))
+        for c in clients:
+            log(logging.INFO, "   - %s (ID: %s)", c['name'], c['id'])
         return clients
     else:
-        print(f"❌ Failed to list clients: {response.status_code} - {response.text}")
+        log(logging.ERROR, "❌ Failed to list clients: %s - %s", response.status_code, response.text)
         return []
 
-def test_create_client(token):
+async def test_create_client(client):
     """Create a test client"""
-    print("\n➕ Creating test client...")
-    response = requests.post(
-        f"{API_BASE_URL}/clients",
-        headers={"Authorization": f"Bearer {token}"},
+    logger.info("\n➕ Creating test client...")
+    response = await client.post(
+        "/clients",
         json={"name": f"Test Client {int(time.time())}"}
     )
     
     if response.status_code == 200:
-        client = response.json()
-        print(f"✅ Client created: {client['name']} (ID: {client['id']})")
-        return client
+        new_client = response.json()
+        logger.info("✅ Client created: %s (ID: %s)", new_client['name'], new_client['id'])
+        return new_client
     else:
-        print(f"❌ Failed to create client: {response.status_code} - {response.text}")
+        logger.error("❌ Failed to create client: %s - %s", response.status_code, response.text)
         return None
 
-def test_create_config(token, client_id):
+async def test_create_config(client, client_id):
     """Create a test configuration"""
-    print(f"\n⚙️  Creating config for client {client_id}...")
-    response = requests.post(
-        f"{API_BASE_URL}/configs",
-        headers={"Authorization": f"Bearer {token}"},
-        json={
-            "client_id": client_id,
-            "reddit_subreddits": ["technology", "programming"],
-            "keywords": ["API", "integration"],
-            "is_active": True,
-            "scan_interval_minutes": 360,
-            "scan_start_hour": 0,
-            "scan_end_hour": 23,
-            "scan_days": "1,2,3,4,5,6,7"
-        }
+    logger.info("\n⚙️  Creating config for client %s...", client_id)
+    payload = {"client_id": client_id} | CONFIG_TEMPLATE
+    response = await client.post(
+        "/configs",
+        content=orjson.dumps(payload),
+        headers=_JSON_HEADERS
     )
     
     if response.status_code == 200:
         config = response.json()
-        print(f"✅ Config created (ID: {config['id']})")
+        logger.info("✅ Config created (ID: %s)", config['id'])
         return config
     else:
-        print(f"❌ Failed to create config: {response.status_code} - {response.text}")
+        logger.error("❌ Failed to create config: %s - %s", response.status_code, response.text)
         return None
 
-def test_list_configs(token):
+async def test_list_configs(client, log=logger.log):
     """List configurations"""
-    print("\n📋 Listing configs...")
-    response = requests.get(
-        f"{API_BASE_URL}/configs",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    log(logging.INFO, "\n📋 Listing configs...")
+    response = await client.get("/configs")
     
     if response.status_code == 200:
-        configs = response.json()
-        print(f"✅ Found {len(configs)} configs")
+        configs = orjson.loads(response.content)
+        log(logging.INFO, "✅ Found %s configs", len(configs))
         for config in configs:
-            print(f"   - Config {config['id']} for client {config['client_id']}")
+            log(logging.INFO, "   - Config %s for client %s", config['id'], config['client_id'])
         return configs
     else:
-        print(f"❌ Failed to list configs: {response.status_code} - {response.text}")
+        log(logging.ERROR, "❌ Failed to list configs: %s - %s", response.status_code, response.text)
         return []
 
-def test_trigger_scan(token):
+async def test_trigger_scan(client):
     """Trigger a manual scan"""
-    print("\n🔄 Triggering scan...")
-    response = requests.post(
-        f"{API_BASE_URL}/ops/scan",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    logger.info("\n🔄 Triggering scan...")
+    response = await client.post("/ops/scan")
     
     if response.status_code == 200:
         result = response.json()
-        print(f"✅ Scan triggered successfully")
-        print(f"   Status: {result.get('status')}")
-        print(f"   Method: {result.get('method')}")
+        logger.info("✅ Scan triggered successfully")
+        logger.info("   Status: %s", result.get('status'))
+        logger.info("   Method: %s", result.get('method'))
         if result.get('created_posts') is not None:
-            print(f"   Posts created: {result.get('created_posts')}")
-            print(f"   Responses created: {result.get('created_responses')}")
+            logger.info("   Posts created: %s", result.get('created_posts'))
+            logger.info("   Responses created: %s", result.get('created_responses'))
         return result
     else:
-        print(f"❌ Failed to trigger scan: {response.status_code} - {response.text}")
+        logger.error("❌ Failed to trigger scan: %s - %s", response.status_code, response.text)
         return None
 
-def test_list_posts(token):
+async def test_list_posts(client, log=logger.log):
     """List matched posts"""
-    print("\n📋 Listing posts...")
-    response = requests.get(
-        f"{API_BASE_URL}/posts",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    log(logging.INFO, "\n📋 Listing posts...")
+    response = await client.get("/posts", params={"limit": POSTS_PREVIEW_LIMIT, "offset": 0})
     
     if response.status_code == 200:
-        posts = response.json()
-        print(f"✅ Found {len(posts)} posts")
-        for post in posts[:5]:  # Show first 5
-            print(f"   - {post['title'][:60]}... (r/{post['subreddit']})")
+        posts = orjson.loads(response.content)
+        log(logging.INFO, "✅ Fetched %s posts (limit %s)", len(posts), POSTS_PREVIEW_LIMIT)
+        for post in posts:
+            log(logging.INFO, "   - %s... (r/%s)", post['title'][:60], post['subreddit'])
         return posts
     else:
-        print(f"❌ Failed to list posts: {response.status_code} - {response.text}")
+        log(logging.ERROR, "❌ Failed to list posts: %s - %s", response.status_code, response.text)
         return []
 
+async def run(verbose=False):
+    logger.info("=" * 60)
+    logger.info("Testing Client Creation and Scan Functionality")
+    logger.info("=" * 60)
+    
+    # One keep-alive connection pool for every call against the API; the transport
+    # owns the pool limits and retries failed connects on it
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        transport=httpx.AsyncHTTPTransport(
+            retries=3,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        ),
+        timeout=None,
+        follow_redirects=True,
+    ) as client:
+        # Login
+        token = await test_login(client)
+        if not token:
+            logger.error("\n❌ Cannot proceed without authentication")
+            return
+        
+        # Default headers are merged into every request, so authenticate the client once
+        client.headers["Authorization"] = f"Bearer {token}"
+        
+        # Create a new client
+        new_client = await test_create_client(client)
+        if not new_client:
+            logger.error("\n❌ Cannot proceed without a client")
+            return
+        
+        # Create a config for the new client
+        config = await test_create_config(client, new_client['id'])
+        if not config:
+            logger.warning("\n⚠️  Config creation failed, but continuing...")
+        
+        # Trigger a scan. A sync scan has already finished when the response arrives
+        # (it carries the created counts), so the listings can follow immediately
+        await test_trigger_scan(client)
+        
+        # The listings are independent reads, so fetch them concurrently and log each
+        # one's buffered records in order. The client listing is only for ad-hoc
+        # debugging; the POST already returned the new id
+        listings = [test_list_configs, test_list_posts]
+        if verbose:
+            listings.insert(0, test_list_clients)
+        outputs = [[] for _ in listings]
+        await asyncio.gather(*(
+            listing(client, log=lambda *record, lines=lines: lines.append(record))
+            for listing, lines in zip(listings, outputs)
+        ))
+        for lines in outputs:
+            for record in lines:
+                logger.log(*record)
+    
+    logger.info("\n" + "=" * 60)
+    logger.info("✅ All tests completed!")
+    logger.info("=" * 60)
+
 def main():
-    print("=" * 60)
-    print("Testing Client Creation and Scan Functionality")
-    print("=" * 60)
-    
-    # Login
-    token = test_login()
-    if not token:
-        print("\n❌ Cannot proceed without authentication")
-        return
-    
-    # List existing clients
-    existing_clients = test_list_clients(token)
-    
-    # Create a new client
-    new_client = test_create_client(token)
-    if not new_client:
-        print("\n❌ Cannot proceed without a client")
-        return
-    
-    # Create a config for the new client
-    config = test_create_config(token, new_client['id'])
-    if not config:
-        print("\n⚠️  Config creation failed, but continuing...")
-    
-    # List all configs
-    test_list_configs(token)
-    
-    # Trigger a scan
-    scan_result = test_trigger_scan(token)
-    
-    # Wait a bit for scan to complete (if sync)
-    if scan_result and scan_result.get('method') == 'sync':
-        print("\n⏳ Waiting for scan to complete...")
-        time.sleep(2)
+    parser = argparse.ArgumentParser(description="Client creation and scan smoke test")
+    parser.add_argument("--verbose", action="store_true", help="Also list all existing clients")
+    parser.add_argument("--quiet", action="store_true", help="Only report warnings and failures")
+    args = parser.parse_args()
     
-    # List posts
-    test_list_posts(token)
+    # Arguments are formatted only for records that pass the level
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
     
-    print("\n" + "=" * 60)
-    print("✅ All tests completed!")
-    print("=" * 60)
+    asyncio.run(run(verbose=args.verbose))
 
 if __name__ == "__main__":
     main()
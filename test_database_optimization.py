@@ -5,116 +5,162 @@ Test script to verify database optimizations.
 
 import sys
 import time
-from sqlalchemy.orm import joinedload
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+import orjson
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 from app.db.session import get_db, get_connection_pool_stats, check_database_health
 from app.models.post import MatchedPost, AIResponse
 from app.models.user import User
 from app.models.config import ClientConfig
 
 
-def test_connection_pool():
+def test_connection_pool(stats, health, log=print):
     """Test connection pool statistics."""
-    print("\n=== Testing Connection Pool ===")
+    log("\n=== Testing Connection Pool ===")
     
-    stats = get_connection_pool_stats()
-    print(f"Pool Size: {stats['pool_size']}")
-    print(f"Max Overflow: {stats['max_overflow']}")
-    print(f"Checked Out: {stats['checked_out']}")
-    print(f"Checked In: {stats['checked_in']}")
-    print(f"Total Capacity: {stats['total_connections']}")
+    log(f"Pool Size: {stats['pool_size']}")
+    log(f"Max Overflow: {stats['max_overflow']}")
+    log(f"Checked Out: {stats['checked_out']}")
+    log(f"Checked In: {stats['checked_in']}")
+    log(f"Total Capacity: {stats['total_connections']}")
     
-    health = check_database_health()
-    print(f"Health Status: {health['status']}")
+    log(f"Health Status: {health['status']}")
     
     assert stats['pool_size'] == 5, "Pool size should be 5"
     assert stats['max_overflow'] == 15, "Max overflow should be 15"
-    print("✓ Connection pool configuration correct")
+    log("✓ Connection pool configuration correct")
 
 
-def test_eager_loading():
+def _best_of(db, run, repeats=5):
+    """Fastest of several timed runs, each from an empty identity map; returns (seconds, result)."""
+    best = float("inf")
+    for _ in range(repeats):
+        db.expunge_all()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def test_eager_loading(db):
     """Test eager loading to prevent N+1 queries."""
     print("\n=== Testing Eager Loading ===")
     
-    db = next(get_db())
+    if db.query(MatchedPost.id).limit(1).first() is None:
+        print("⚠ Skipping eager-load test — table empty")
+        return
     
-    try:
-        # Test without eager loading (will cause N+1 if there are posts)
-        start = time.time()
-        posts_without = db.query(MatchedPost).limit(10).all()
-        time_without = time.time() - start
-        
-        # Access responses to trigger lazy loading
-        for post in posts_without:
+    # Warm the pooled connection and the compiled-statement cache so the first
+    # timed arm doesn't pay for them
+    db.execute(text("SELECT 1"))
+    db.query(MatchedPost).limit(1).all()
+    
+    def load_posts(*options):
+        posts = db.query(MatchedPost).options(*options).limit(10).all()
+        # Access responses: lazy loads them one post at a time unless eager loaded
+        for post in posts:
             _ = post.responses
-        
-        # Test with eager loading
-        start = time.time()
-        posts_with = db.query(MatchedPost).options(
-            joinedload(MatchedPost.responses)
-        ).limit(10).all()
-        time_with = time.time() - start
-        
-        # Access responses (already loaded)
-        for post in posts_with:
+        return posts
+    
+    # Test without eager loading (will cause N+1 if there are posts)
+    time_without, posts_without = _best_of(db, load_posts)
+    
+    # Test with eager loading. selectinload fetches the responses in one
+    # extra IN query; joinedload would repeat each post row once per response
+    time_with, posts_with = _best_of(db, lambda: load_posts(selectinload(MatchedPost.responses)))
+    
+    # Compare against joinedload to keep the row blow-up visible
+    time_joined, posts_joined = _best_of(db, lambda: load_posts(joinedload(MatchedPost.responses)))
+    
+    responses_loaded = sum(len(post.responses) for post in posts_with)
+    joined_rows = sum(max(len(post.responses), 1) for post in posts_joined)
+    
+    print(f"Without eager loading: {time_without:.4f}s")
+    print(f"With eager loading (selectinload): {time_with:.4f}s")
+    print(f"With eager loading (joinedload): {time_joined:.4f}s")
+    print(f"Rows fetched: selectinload {len(posts_with) + responses_loaded}, joinedload {joined_rows}")
+    
+    # Any relationship the eager options miss raises instead of lazy loading
+    db.expunge_all()
+    posts_strict = db.query(MatchedPost).options(
+        selectinload(MatchedPost.responses), raiseload("*")
+    ).limit(10).all()
+    try:
+        for post in posts_strict:
             _ = post.responses
-        
-        print(f"Without eager loading: {time_without:.4f}s")
-        print(f"With eager loading: {time_with:.4f}s")
-        
-        if len(posts_with) > 0:
-            improvement = ((time_without - time_with) / time_without * 100) if time_without > 0 else 0
-            print(f"Performance improvement: {improvement:.1f}%")
-        
-        print("✓ Eager loading working correctly")
-        
-    finally:
-        db.close()
+    except InvalidRequestError as e:
+        raise AssertionError(f"Unexpected lazy load on MatchedPost: {e}") from e
+    
+    improvement = ((time_without - time_with) / time_without * 100) if time_without > 0 else 0
+    print(f"Performance improvement: {improvement:.1f}%")
+    
+    print("✓ Eager loading working correctly")
+
+
+INDEXED_QUERY = "SELECT * FROM matched_posts WHERE client_id = 1 ORDER BY created_at DESC LIMIT 10"
+
+
+def _plan_index_scans(node):
+    """Yield (node type, index name) for every index scan in an EXPLAIN JSON plan."""
+    if "Index Name" in node:
+        yield node["Node Type"], node["Index Name"]
+    for child in node.get("Plans", []):
+        yield from _plan_index_scans(child)
 
 
-def test_indexes():
+def test_indexes(db, log=print):
     """Test that indexes are being used (requires EXPLAIN ANALYZE)."""
-    print("\n=== Testing Database Indexes ===")
+    log("\n=== Testing Database Indexes ===")
     
-    db = next(get_db())
+    # Planner estimates from the catalog instead of two full-table counts
+    estimates = dict(db.execute(
+        text("SELECT relname, GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname IN ('matched_posts', 'ai_responses')")
+    ).all())
     
-    try:
-        # Check if tables exist
-        posts_count = db.query(MatchedPost).count()
-        responses_count = db.query(AIResponse).count()
-        
-        print(f"Posts in database: {posts_count}")
-        print(f"Responses in database: {responses_count}")
-        
-        # Test indexed query performance
-        start = time.time()
-        result = db.query(MatchedPost).filter(
-            MatchedPost.client_id == 1
-        ).order_by(MatchedPost.created_at.desc()).limit(10).all()
-        query_time = time.time() - start
-        
-        print(f"Indexed query time: {query_time:.4f}s")
-        
-        if query_time < 0.1:
-            print("✓ Query performance is good (< 100ms)")
-        else:
-            print("⚠ Query performance could be improved")
-        
-    finally:
-        db.close()
+    log(f"Posts in database (estimate): {estimates.get('matched_posts', 0)}")
+    log(f"Responses in database (estimate): {estimates.get('ai_responses', 0)}")
+    
+    # Ask the planner which plan it picked for the per-client feed query
+    explain = db.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {INDEXED_QUERY}")
+    ).scalar()
+    if isinstance(explain, (str, bytes)):
+        explain = orjson.loads(explain)
+    plan = explain[0]
+    query_time = plan["Execution Time"] / 1000
+    
+    log(f"Indexed query time: {query_time:.4f}s")
+    
+    scans = dict((name, node_type) for node_type, name in _plan_index_scans(plan["Plan"]))
+    if "idx_client_created" in scans:
+        log(f"✓ {scans['idx_client_created']} on idx_client_created")
+    else:
+        # Tiny tables are cheaper to scan sequentially, so this is only a warning
+        log(f"⚠ idx_client_created not used (index scans: {list(scans) or 'none'})")
 
 
-def test_health_endpoints():
+def test_health_endpoints(stats, health, log=print):
     """Test that health check functions work."""
-    print("\n=== Testing Health Check Functions ===")
+    log("\n=== Testing Health Check Functions ===")
     
-    health = check_database_health()
-    print(f"Database Health: {health['status']}")
+    log(f"Database Health: {health['status']}")
     
     if 'pool_stats' in health:
-        print("✓ Pool stats included in health check")
+        log("✓ Pool stats included in health check")
     
-    stats = get_connection_pool_stats()
-    print(f"✓ Connection pool stats retrieved: {len(stats)} metrics")
+    log(f"✓ Connection pool stats retrieved: {len(stats)} metrics")
+
+
+def _test_indexes_own_session(log=print):
+    """Run test_indexes on a session of its own; sessions are not thread-safe."""
+    db = next(get_db())
+    try:
+        test_indexes(db, log=log)
+    finally:
+        db.close()
 
 
 def main():
@@ -123,11 +169,39 @@ def main():
     print("Database Optimization Test Suite")
     print("=" * 60)
     
+    # One session for the subtests that query through the ORM
+    db = next(get_db())
+    baseline = get_connection_pool_stats()['checked_out']
+    
     try:
-        test_connection_pool()
-        test_health_endpoints()
-        test_indexes()
-        test_eager_loading()
+        # Both pool subtests check the same snapshot, so probe the pool once
+        stats = get_connection_pool_stats()
+        health = check_database_health()
+        subtests = [
+            partial(test_connection_pool, stats, health),
+            partial(test_health_endpoints, stats, health),
+            _test_indexes_own_session,
+        ]
+        
+        # The read-only subtests are independent, so run them concurrently and
+        # print each one's buffered output in order
+        outputs = [[] for _ in subtests]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(subtest, log=lines.append)
+                for subtest, lines in zip(subtests, outputs)
+            ]
+            wait(futures)
+        for lines in outputs:
+            for line in lines:
+                print(line)
+        for future in futures:
+            future.result()
+        
+        test_eager_loading(db)
+        
+        db.close()
+        print(f"\nChecked out connections: {baseline} before, {get_connection_pool_stats()['checked_out']} after")
         
         print("\n" + "=" * 60)
         print("✓ All tests passed!")
@@ -139,6 +213,9 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+        
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
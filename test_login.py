@@ -3,7 +3,6 @@
 Simple script to test the login functionality
 """
 import requests
-import json
 
 def test_login():
     # Test login endpoint
@@ -20,28 +19,30 @@ def test_login():
     print(f"Data: {login_data}")
     
     try:
-        response = requests.post(login_url, data=login_data)
-        print(f"Status Code: {response.status_code}")
-        print(f"Response: {response.text}")
-        
-        if response.status_code == 200:
-            token_data = response.json()
-            print("✅ Login successful!")
-            print(f"Token: {token_data.get('access_token', 'N/A')}")
+        # One session keeps the connection alive from login to the dashboard call
+        with requests.Session() as session:
+            response = session.post(login_url, data=login_data)
+            print(f"Status Code: {response.status_code}")
+            print(f"Response: {response.text}")
             
-            # Test dashboard endpoint with token
-            token = token_data.get('access_token')
-            if token:
-                dashboard_url = "http://localhost/api/analytics/dashboard"
-                headers = {"Authorization": f"Bearer {token}"}
+            if response.status_code == 200:
+                token_data = response.json()
+                print("✅ Login successful!")
+                print(f"Token: {token_data.get('access_token', 'N/A')}")
                 
-                print("\nTesting dashboard endpoint...")
-                dashboard_response = requests.get(dashboard_url, headers=headers)
-                print(f"Dashboard Status: {dashboard_response.status_code}")
-                print(f"Dashboard Response: {dashboard_response.text}")
-                
-        else:
-            print("❌ Login failed!")
+                # Test dashboard endpoint with token
+                token = token_data.get('access_token')
+                if token:
+                    dashboard_url = "http://localhost/api/analytics/dashboard"
+                    session.headers.update({"Authorization": f"Bearer {token}"})
+                    
+                    print("\nTesting dashboard endpoint...")
+                    dashboard_response = session.get(dashboard_url)
+                    print(f"Dashboard Status: {dashboard_response.status_code}")
+                    print(f"Dashboard Response: {dashboard_response.text}")
+                    
+            else:
+                print("❌ Login failed!")
             
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {e}")
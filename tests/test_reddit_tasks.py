@@ -0,0 +1,32 @@
+import asyncio
+
+from app.tasks import reddit_tasks
+
+
+def test_generate_replies_for_post_fetches_context(monkeypatch):
+    """Google and YouTube results reach the reply generator as context."""
+    async def fake_google(query, num):
+        return [{"title": "Google hit", "link": "https://example.com/g"}]
+    
+    async def fake_youtube(query, num):
+        return [{"title": "YouTube hit", "url": "https://example.com/y"}]
+    
+    captured = {}
+    
+    def fake_generate(prompt, context, num):
+        captured["context"] = context
+        return []
+    
+    monkeypatch.setattr(reddit_tasks, "fetch_google_results", fake_google)
+    monkeypatch.setattr(reddit_tasks, "fetch_youtube_results", fake_youtube)
+    monkeypatch.setattr(reddit_tasks, "generate_reddit_replies", fake_generate)
+    
+    # An earlier asyncio.run leaves the thread without a current event loop
+    asyncio.run(asyncio.sleep(0))
+    
+    result = reddit_tasks.generate_replies_for_post(1, 1, "Some title")
+    
+    assert result == {"post_id": 1, "created_responses": 0}
+    assert captured["context"]
+    assert "Google hit" in captured["context"]
+    assert "YouTube hit" in captured["context"]